@@ -8,6 +8,9 @@ ALGORITHM_LIST = [
     ("BFS", "bfs"),
     ("BFS (Double Moves)", "bfs_ANDOR"),
 
+    ("Bidirectional BFS", "bidirectional_bfs"),
+    ("Bidirectional BFS (Double)", "bidirectional_bfs_ANDOR"),
+
     ("UCS", "ucs"),
     ("UCS (Double Moves)", "ucs_ANDOR"),
 
@@ -35,5 +38,9 @@ ALGORITHM_LIST = [
     ("Simulated Annealing", "simulated_annealing"),
     ("Simulated Annealing (Double)", "simulated_annealing_ANDOR"),
      ("QLearning", "q_learning"),
+    ("Value Iteration", "value_iteration"),
+
+    ("Distance Oracle", "oracle"),
+    ("Portfolio (Race)", "portfolio"),
     
 ]
\ No newline at end of file
@@ -1,62 +1,55 @@
-from heapq import heappush, heappop
+from .budget import budgeted
+from .core import get_neighbor_moves
+from .heuristics import bind_heuristic
+from .open_list import make_open_list
+from .ranking import StateIndexer
 
-def manhattan_distance(state, goal_state):
-    total = 0
-    for i in range(9):
-        if state[i] != 9:
-            curr_row, curr_col = divmod(i, 3)
-            goal_pos = goal_state.index(state[i])
-            goal_row, goal_col = divmod(goal_pos, 3)
-            total += abs(curr_row - goal_row) + abs(curr_col - goal_col)
-    return total
+@budgeted
+def solve(start_state, goal_state, heuristic="manhattan", open_list="bucket", *, meter):
+    """Solves the 8-puzzle using A* (Manhattan distance by default; see heuristics.HEURISTICS).
 
-def get_neighbors(state):
-    neighbors = []
-    s = list(state)
-    blank_index = s.index(9)
-    row, col = divmod(blank_index, 3)
-    moves = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-    for dr, dc in moves:
-        new_row = row + dr
-        new_col = col + dc
-        if 0 <= new_row < 3 and 0 <= new_col < 3:
-            new_index = new_row * 3 + new_col
-            new_s = s[:]
-            new_s[blank_index], new_s[new_index] = new_s[new_index], new_s[blank_index]
-            neighbors.append(tuple(new_s))
-    return neighbors
-
-def reconstruct_path(state, parent):
-    path = []
-    while state is not None:
-        path.append(state)
-        state = parent[state]
-    path.reverse()
-    return path
-
-def solve(start_state, goal_state):
-    """Solves the 8-puzzle using A* with Manhattan distance."""
-    pq = [(0 + manhattan_distance(start_state, goal_state), 0, start_state)]
-    parent = {start_state: None}
-    g_costs = {start_state: 0}
-    visited = set()
+    Among nodes with equal f the deepest (highest g) is expanded first.
+    """
+    meter.phase("setup")
+    h = bind_heuristic(heuristic, goal_state)
+    indexer = StateIndexer(len(start_state))
+    index = indexer.index
+    start = index(start_state)
+    goal = index(goal_state)
+    parent = indexer.table('i', -1)
+    g_costs = indexer.table('H', 0xFFFF)
+    visited = indexer.table('B', 0)
+    parent[start] = start
+    g_costs[start] = 0
+    h_start, extra = h.evaluate(start_state)
+    meter.evaluations += 1
+    pq = make_open_list(open_list, tie_break="high")
+    pq.push(0 + h_start, (start, start_state, extra), 0)
+    meter.phase("search")
     
     while pq:
-        f_value, g_value, current = heappop(pq)
-        if current == goal_state:
-            return reconstruct_path(current, parent)
-        if current in visited:
+        f_value, g_value, (current, current_state, extra) = pq.pop()
+        if current == goal:
+            meter.phase("path")
+            return indexer.path(current, parent)
+        if visited[current]:
             continue
-        visited.add(current)
-        for next_state in get_neighbors(current):
-            if next_state in visited:
+        visited[current] = 1
+        meter.tick(len(pq), meter.expanded + 1)  # the closed set is exactly the expanded nodes
+        h_current = f_value - g_value
+        children = get_neighbor_moves(current_state)
+        meter.generated += len(children)
+        for next_state, source, target in children:
+            next_rank = index(next_state)
+            if visited[next_rank]:
                 continue
             new_g = g_value + 1
-            h_value = manhattan_distance(next_state, goal_state)
-            f_value = new_g + h_value
-            if next_state in g_costs and new_g >= g_costs[next_state]:
+            if new_g >= g_costs[next_rank]:
                 continue
-            g_costs[next_state] = new_g
-            parent[next_state] = current
-            heappush(pq, (f_value, new_g, next_state))
-    return None
\ No newline at end of file
+            h_value, next_extra = h.update(current_state, next_state, h_current, extra, source, target)
+            meter.evaluations += 1
+            f_value = new_g + h_value
+            g_costs[next_rank] = new_g
+            parent[next_rank] = current
+            pq.push(f_value, (next_rank, next_state, next_extra), new_g)
+    return None
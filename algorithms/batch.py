@@ -0,0 +1,216 @@
+"""Headless batch solver: reads puzzles as JSON lines and writes one JSON result per line.
+
+    python -m algorithms.batch puzzles.jsonl --algorithm ida_star > results.jsonl
+    cat puzzles.jsonl | python -m algorithms.batch --algorithm "A* Search"
+    python -m algorithms.batch puzzles.jsonl --workers 8 --unordered
+
+Every input line is an object with a "start" state and optionally a "goal" (tiles
+in order with the blank last by default), an "algorithm" overriding --algorithm,
+and an "id" that is echoed back. Algorithms are named by module or by their label
+in ALGORITHM_LIST. Only the solver modules are imported -- never pygame or the UI
+-- and anything a solver prints goes to stderr so stdout stays valid JSONL.
+With --workers the puzzles are spread over a multiprocessing pool.
+"""
+import argparse
+import importlib
+import json
+import multiprocessing
+import random
+import sys
+import time
+from contextlib import redirect_stdout
+from itertools import chain
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from . import ALGORITHM_LIST
+from .budget import Budget
+from .core import State, board_size, is_solvable, manhattan_deltas, move_string, move_tables
+from .stats import BUDGET_EXCEEDED, SOLVED
+
+DEFAULT_ALGORITHM = "ida_star"
+
+
+def resolve_algorithm(name: str) -> str:
+    """Returns the module name for an algorithm given by module name or ALGORITHM_LIST label."""
+    for label, module_name in ALGORITHM_LIST:
+        if name == module_name or name.lower() == label.lower():
+            return module_name
+    raise ValueError(f"Unknown algorithm '{name}'. Available: {', '.join(m for _, m in ALGORITHM_LIST)}.")
+
+
+def standard_goal(length: int) -> State:
+    """Tiles 1..length-1 in reading order with the blank in the last cell."""
+    return tuple(range(1, length + 1))
+
+
+def solve_instance(algorithm: str, start_state: State, goal_state: State,
+                   seed: Optional[int] = None, budget: Optional[Budget] = None) -> Dict:
+    """Runs one solver on one puzzle and returns its JSON-ready result record.
+
+    The solver's SearchStats go under "stats"; a solver stopped by ``budget``, or one
+    whose path skips a move or misses either end, yields "solved": false with the
+    reason in "error" and its counters still in "stats".
+    """
+    module_name = resolve_algorithm(algorithm)
+    record = {"algorithm": module_name, "start": list(start_state), "goal": list(goal_state)}
+    if not board_size(start_state) or not is_solvable(start_state, goal_state):
+        record.update(solved=False, error="unsolvable or invalid puzzle")
+        return record
+    module = importlib.import_module(f"algorithms.{module_name}")
+    if seed is not None:
+        random.seed(seed)
+    started = time.perf_counter()
+    with redirect_stdout(sys.stderr):
+        stats = module.solve(start_state, goal_state, budget=budget)
+    elapsed = time.perf_counter() - started
+    path = [tuple(s) for s in stats.path] if stats.path else None
+    moves, invalid = None, None
+    if path:
+        # A solver bug (say, a restart that jumps without cutting its path) must not
+        # pass as a solution, nor lose the counters of the run that produced it.
+        try:
+            moves = move_string(path)
+        except ValueError as e:
+            invalid = f"invalid path: {e}"
+        else:
+            if path[0] != start_state:
+                invalid = "invalid path: it does not begin at the start state"
+            elif stats.status == SOLVED and path[-1] != goal_state:
+                invalid = "invalid path: it does not end at the goal state"
+    record.update(solved=stats.status == SOLVED and invalid is None, steps=stats.steps, moves=moves,
+                  path=[list(s) for s in path] if path else None,
+                  nodes_expanded=stats.expanded, time=round(elapsed, 6), stats=stats.as_dict())
+    if stats.status == BUDGET_EXCEEDED:
+        record["error"] = f"budget exceeded: {stats.reason}"
+    elif invalid is not None:
+        record["error"] = invalid
+    return record
+
+
+def parse_instance(line: str, default_algorithm: str) -> Tuple[Optional[object], str, State, State]:
+    """Decodes one input line into (id, algorithm, start, goal)."""
+    item = json.loads(line)
+    if isinstance(item, list):
+        item = {"start": item}
+    start_state = tuple(item["start"])
+    goal_state = tuple(item["goal"]) if item.get("goal") is not None else standard_goal(len(start_state))
+    return item.get("id"), item.get("algorithm") or default_algorithm, start_state, goal_state
+
+
+def solve_line(line_number: int, line: str, algorithm: str = DEFAULT_ALGORITHM,
+               seed: Optional[int] = None, budget: Optional[Budget] = None) -> Dict:
+    """Parses and solves one input line; errors become a record with "solved": false."""
+    try:
+        instance_id, name, start_state, goal_state = parse_instance(line, algorithm)
+        record = solve_instance(name, start_state, goal_state, seed, budget)
+    except (ValueError, KeyError, TypeError) as e:
+        instance_id, record = None, {"solved": False, "error": str(e)}
+    except Exception as e:
+        instance_id, record = None, {"solved": False, "error": f"{type(e).__name__}: {e}"}
+    return {"line": line_number, **({"id": instance_id} if instance_id is not None else {}), **record}
+
+
+def warm_up(algorithm: str, length: int = 9) -> None:
+    """Imports the solver and builds the tables it shares across puzzles of this board size.
+
+    Called in the parent before the pool forks, so workers inherit the move tables,
+    Manhattan deltas, rank tables and mapped table files copy-on-write; as the pool
+    initializer it does the same once per worker where processes are spawned instead.
+    """
+    module_name = resolve_algorithm(algorithm)
+    importlib.import_module(f"algorithms.{module_name}")
+    if not move_tables(length):
+        return
+    manhattan_deltas(standard_goal(length))
+    if module_name == "oracle" and length == 9:
+        from .oracle import STANDARD_GOAL, distance_table
+        distance_table(STANDARD_GOAL)
+
+
+def _solve_task(task: Tuple[int, str, str, Optional[int], Optional[Budget]]) -> Dict:
+    return solve_line(*task)
+
+
+def solve_stream(lines: Iterable[str], algorithm: str = DEFAULT_ALGORITHM, seed: Optional[int] = None,
+                 workers: int = 1, ordered: bool = True, chunksize: int = 16,
+                 budget: Optional[Budget] = None) -> Iterator[Dict]:
+    """Yields one result record per non-blank input line.
+
+    With ``workers`` > 1 the puzzles are fanned out over a process pool; results come
+    back in input order, or as they complete when ``ordered`` is False (every record
+    carries its input line number either way).
+    """
+    tasks = ((number, line, algorithm, seed, budget) for number, line in enumerate(lines, 1) if line.strip())
+    if workers <= 1:
+        for task in tasks:
+            yield _solve_task(task)
+        return
+    # Peek at the first puzzle to learn the board size the shared tables are built for.
+    first = next(tasks, None)
+    if first is None:
+        return
+    try:
+        length = len(parse_instance(first[1], algorithm)[2])
+    except (ValueError, KeyError, TypeError):
+        length = 9
+    warm_up(algorithm, length)
+    with multiprocessing.Pool(workers, initializer=warm_up, initargs=(algorithm, length)) as pool:
+        mapper = pool.imap if ordered else pool.imap_unordered
+        yield from mapper(_solve_task, chain([first], tasks), chunksize)
+
+
+def run(lines: Iterable[str], output: TextIO, algorithm: str = DEFAULT_ALGORITHM, seed: Optional[int] = None,
+        workers: int = 1, ordered: bool = True, chunksize: int = 16, budget: Optional[Budget] = None) -> int:
+    """Solves every puzzle in ``lines``, writing one result per line; returns the number of failures."""
+    failures = 0
+    for record in solve_stream(lines, algorithm, seed, workers, ordered, chunksize, budget):
+        if not record["solved"]:
+            failures += 1
+        output.write(json.dumps(record) + "\n")
+        output.flush()
+    return failures
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m algorithms.batch",
+                                     description="Solve sliding puzzles from JSON lines without the UI.")
+    parser.add_argument("input", nargs="?", default="-", help="JSONL file of puzzles ('-' for stdin)")
+    parser.add_argument("-o", "--output", default="-", help="file for the JSONL results ('-' for stdout)")
+    parser.add_argument("-a", "--algorithm", default=DEFAULT_ALGORITHM,
+                        help="module name or ALGORITHM_LIST label (default: %(default)s)")
+    parser.add_argument("--seed", type=int, help="reseed random before each puzzle (stochastic solvers)")
+    parser.add_argument("-j", "--workers", type=int, default=1,
+                        help="solve in a pool of this many processes (0: one per CPU)")
+    parser.add_argument("--unordered", action="store_true",
+                        help="with --workers, write results as they complete instead of in input order")
+    parser.add_argument("--chunksize", type=int, default=16, help="puzzles sent to a worker at a time")
+    parser.add_argument("--time-limit", type=float, help="seconds allowed per puzzle")
+    parser.add_argument("--max-expansions", type=int, help="node expansions allowed per puzzle")
+    parser.add_argument("--max-memory", type=float, help="MB of resident memory a worker may reach")
+    parser.add_argument("--list", action="store_true", help="list the available algorithms and exit")
+    args = parser.parse_args(argv)
+    if args.list:
+        for label, module_name in ALGORITHM_LIST:
+            print(f"{module_name:28s} {label}")
+        return 0
+    try:
+        resolve_algorithm(args.algorithm)
+    except ValueError as e:
+        parser.error(str(e))
+
+    source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    target = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        workers = args.workers or multiprocessing.cpu_count()
+        budget = Budget(args.time_limit, args.max_expansions, args.max_memory)
+        failures = run(source, target, args.algorithm, args.seed, workers, not args.unordered, args.chunksize, budget)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,321 @@
+"""Benchmark corpus and runner: every solver on 3x3 puzzles bucketed by optimal depth.
+
+    python -m algorithms.benchmark run -o results.json
+    python -m algorithms.benchmark run --corpus double -a a_star ida_star_ANDOR --time-limit 2
+    python -m algorithms.benchmark generate --per-depth 10
+    python -m algorithms.benchmark compare baseline.json candidate.json
+
+The corpus in benchmarks/ holds up to PER_DEPTH random solvable instances for every
+optimal depth: 0-31 single slides (corpus_single.jsonl) and 0-16 actions when a
+double move counts as one (corpus_double.jsonl). Depths come from the oracle's
+distance tables, and the instances are drawn with a fixed seed, so regenerating
+reproduces the same files. Each line is a batch input line plus "depth" and
+"double_moves", so the files can also be fed to ``python -m algorithms.batch``.
+
+The runner solves every instance with every selected algorithm, reseeding random
+before each solve, and records wall time, expansions, peak traced memory and
+solution quality (cost above the optimal depth). Timings are repeated REPEAT times
+in interleaved passes -- every algorithm on every instance, then the next pass --
+so drift in machine load spreads over the repeats of each instance instead of
+shifting whole buckets; a run keeps the median and all repeat times. Cost is counted in the corpus'
+own metric: single slides for the single-move corpus, actions for the double one.
+Results are written as JSON (every run plus a per-depth-bucket summary) and
+printed as a table. ``compare`` checks two such files for regressions (see
+regression.py) and exits with status 1 when it finds any.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from . import ALGORITHM_LIST
+from .batch import resolve_algorithm, solve_instance, warm_up
+from .budget import Budget
+from .oracle import STANDARD_GOAL, distance_table
+from .ranking import solvable_state
+from .stats import BUDGET_EXCEEDED
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks")
+CORPORA = {"single": "corpus_single.jsonl", "double": "corpus_double.jsonl"}
+PER_DEPTH = 10
+CORPUS_SEED = 8
+RUN_SEED = 0
+TIME_LIMIT = 10.0
+BUCKET_WIDTH = 4
+REPEAT = 3          # timed passes; compare needs at least regression.MIN_REPEAT
+# tracemalloc slows Python allocation-heavy code several times over; the memory
+# pass gets this much more time so it can finish the same search.
+TRACE_SLOWDOWN = 5
+
+
+def generate_corpus(per_depth: int = PER_DEPTH, double_moves: bool = False, seed: int = CORPUS_SEED) -> List[Dict]:
+    """Draws up to ``per_depth`` instances for every optimal depth (all of them where there are fewer)."""
+    table = distance_table(STANDARD_GOAL, double_moves)
+    by_depth: Dict[int, List[int]] = defaultdict(list)
+    for index, depth in enumerate(table[:]):
+        by_depth[depth].append(index)
+    rng = random.Random(seed)
+    prefix = "d" if double_moves else "s"
+    instances = []
+    for depth in sorted(by_depth):
+        chosen = sorted(rng.sample(by_depth[depth], min(per_depth, len(by_depth[depth]))))
+        for number, index in enumerate(chosen):
+            instances.append({"id": f"{prefix}{depth:02d}-{number}", "start": list(solvable_state(index)),
+                              "goal": list(STANDARD_GOAL), "depth": depth, "double_moves": double_moves})
+    return instances
+
+
+def corpus_path(corpus: str) -> str:
+    """Resolves "single"/"double" to the shipped corpus file; anything else is taken as a path."""
+    return os.path.join(CORPUS_DIR, CORPORA[corpus]) if corpus in CORPORA else corpus
+
+
+def write_corpus(instances: Iterable[Dict], path: str) -> None:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as corpus_file:
+        for instance in instances:
+            corpus_file.write(json.dumps(instance) + "\n")
+
+
+def load_corpus(path: str, per_depth: Optional[int] = None, max_depth: Optional[int] = None) -> List[Dict]:
+    """Reads a corpus file, optionally keeping only the first ``per_depth`` instances up to ``max_depth``."""
+    instances, kept = [], defaultdict(int)
+    with open(path, encoding="utf-8") as corpus_file:
+        for line in corpus_file:
+            if not line.strip():
+                continue
+            instance = json.loads(line)
+            depth = instance["depth"]
+            if (max_depth is not None and depth > max_depth) or (per_depth is not None and kept[depth] >= per_depth):
+                continue
+            kept[depth] += 1
+            instances.append(instance)
+    return instances
+
+
+def _traced_peak(algorithm: str, instance: Dict, seed: int, budget: Budget) -> float:
+    """Peak memory (MB) allocated by Python while solving the instance once more under tracemalloc."""
+    tracemalloc.start()
+    try:
+        solve_instance(algorithm, tuple(instance["start"]), tuple(instance["goal"]), seed, budget)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 2 ** 20
+
+
+def measure(algorithm: str, instance: Dict, seed: int = RUN_SEED, budget: Optional[Budget] = None,
+            repeat: int = 1, trace_memory: bool = True, records: Optional[List[Dict]] = None) -> Dict:
+    """Returns the run record of one corpus instance: median time of its repeats, plus all of them.
+
+    ``records`` are batch records of solves already made (run_benchmark interleaves
+    them across passes); without them the instance is solved ``repeat`` times here.
+    """
+    budget = budget or Budget()
+    start_state, goal_state = tuple(instance["start"]), tuple(instance["goal"])
+    if not records:
+        records = [solve_instance(algorithm, start_state, goal_state, seed, budget) for _ in range(max(1, repeat))]
+    times = [r["time"] for r in records if r.get("time") is not None]
+    record = records[0]
+    stats = record.get("stats") or {}
+    double_moves = instance.get("double_moves", False)
+    cost = None
+    if record["solved"]:
+        cost = record["steps"] if double_moves else len(record["moves"])
+    run = {"algorithm": record["algorithm"], "id": instance.get("id"), "depth": instance["depth"],
+           "solved": record["solved"], "status": stats.get("status"), "cost": cost,
+           "excess": None if cost is None else cost - instance["depth"],
+           "time": statistics.median(times) if times else None, "times": times,
+           "expanded": stats.get("expanded"), "generated": stats.get("generated"),
+           "evaluations": stats.get("evaluations"), "memory": None}
+    if trace_memory and "stats" in record:
+        # Solvers are deterministic under the fixed seed, so a rerun capped at the
+        # same expansions walks the same search (and stops where a budget stopped it).
+        expansions = stats["expanded"] + 1 if stats["expanded"] else budget.expansions
+        if stats["status"] == BUDGET_EXCEEDED and stats["reason"] == "expansions":
+            expansions = budget.expansions
+        memory_budget = Budget(budget.time * TRACE_SLOWDOWN if budget.time else None, expansions, budget.memory)
+        run["memory"] = round(_traced_peak(algorithm, instance, seed, memory_budget), 4)
+    return run
+
+
+def bucket_of(depth: int, width: int = BUCKET_WIDTH) -> str:
+    low = depth // width * width
+    return str(depth) if width == 1 else f"{low}-{low + width - 1}"
+
+
+def _mean(values: List[float]) -> Optional[float]:
+    return statistics.fmean(values) if values else None
+
+
+def summarize(runs: Iterable[Dict], width: int = BUCKET_WIDTH) -> Dict[str, Dict[str, Dict]]:
+    """Per algorithm and depth bucket: counts, time, expansions, memory and solution quality."""
+    groups: Dict[str, Dict[str, List[Dict]]] = defaultdict(lambda: defaultdict(list))
+    for run in runs:
+        groups[run["algorithm"]][bucket_of(run["depth"], width)].append(run)
+    summary = {}
+    for algorithm, buckets in groups.items():
+        summary[algorithm] = {}
+        for bucket, bucket_runs in sorted(buckets.items(), key=lambda item: int(item[0].split("-")[0])):
+            solved = [run for run in bucket_runs if run["solved"]]
+            times = [run["time"] for run in bucket_runs if run["time"] is not None]
+            memory = [run["memory"] for run in bucket_runs if run["memory"] is not None]
+            summary[algorithm][bucket] = {
+                "instances": len(bucket_runs), "solved": len(solved),
+                "time_mean": _mean(times), "time_median": statistics.median(times) if times else None,
+                "expanded_mean": _mean([run["expanded"] for run in bucket_runs if run["expanded"] is not None]),
+                "memory_mean": _mean(memory), "memory_max": max(memory) if memory else None,
+                "optimal": sum(1 for run in solved if run["excess"] == 0),
+                "excess_mean": _mean([run["excess"] for run in solved]),
+            }
+    return summary
+
+
+def run_benchmark(instances: Sequence[Dict], algorithms: Sequence[str], seed: int = RUN_SEED,
+                  budget: Optional[Budget] = None, repeat: int = REPEAT, trace_memory: bool = True,
+                  width: int = BUCKET_WIDTH, progress=None) -> Dict:
+    """Runs every algorithm on every instance ``repeat`` times and returns {"meta", "runs", "summary"}."""
+    budget = budget or Budget()
+    for algorithm in algorithms:
+        # Build the solver's shared tables and caches before anything is timed.
+        warm_up(algorithm)
+        if instances:
+            measure(algorithm, instances[-1], seed, budget, trace_memory=False)
+    records: Dict[Tuple[str, int], List[Dict]] = defaultdict(list)
+    for number in range(max(1, repeat)):
+        started = time.perf_counter()
+        for algorithm in algorithms:
+            for position, instance in enumerate(instances):
+                records[algorithm, position].append(solve_instance(
+                    algorithm, tuple(instance["start"]), tuple(instance["goal"]), seed, budget))
+        if progress:
+            progress(f"pass {number + 1}/{max(1, repeat)} in {time.perf_counter() - started:.1f}s")
+    runs = []
+    for algorithm in algorithms:
+        for position, instance in enumerate(instances):
+            runs.append(measure(algorithm, instance, seed, budget, trace_memory=trace_memory,
+                                records=records[algorithm, position]))
+        if progress:
+            solved = sum(1 for run in runs if run["algorithm"] == algorithm and run["solved"])
+            progress(f"{algorithm}: {solved}/{len(instances)} solved")
+    meta = {"seed": seed, "repeat": repeat, "bucket_width": width, "trace_memory": trace_memory,
+            "budget": budget._asdict(), "instances": len(instances), "algorithms": list(algorithms),
+            "python": platform.python_version(), "platform": platform.platform(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S")}
+    return {"meta": meta, "runs": runs, "summary": summarize(runs, width)}
+
+
+def _format(value, spec: str) -> str:
+    return "-" if value is None else format(value, spec)
+
+
+def format_table(summary: Dict[str, Dict[str, Dict]]) -> str:
+    """Renders a summary as a fixed-width text table, one row per algorithm and bucket."""
+    header = (f"{'algorithm':<28}{'depth':>7}{'solved':>9}{'median ms':>11}{'mean ms':>11}"
+              f"{'expanded':>12}{'peak MB':>9}{'optimal':>9}{'excess':>8}")
+    lines = [header, "-" * len(header)]
+    for algorithm, buckets in summary.items():
+        for bucket, row in buckets.items():
+            median = row["time_median"] * 1000 if row["time_median"] is not None else None
+            mean = row["time_mean"] * 1000 if row["time_mean"] is not None else None
+            lines.append(f"{algorithm:<28}{bucket:>7}{row['solved']:>5}/{row['instances']:<3}"
+                         f"{_format(median, '.2f'):>11}{_format(mean, '.2f'):>11}"
+                         f"{_format(row['expanded_mean'], '.0f'):>12}{_format(row['memory_max'], '.2f'):>9}"
+                         f"{row['optimal']:>5}/{row['solved']:<3}{_format(row['excess_mean'], '.1f'):>8}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m algorithms.benchmark",
+                                     description="Benchmark the solvers on puzzles bucketed by optimal depth.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    generate = commands.add_parser("generate", help="regenerate the corpus files in benchmarks/")
+    generate.add_argument("--per-depth", type=int, default=PER_DEPTH, help="instances per depth (default: %(default)s)")
+    generate.add_argument("--seed", type=int, default=CORPUS_SEED, help="sampling seed (default: %(default)s)")
+    generate.add_argument("--output-dir", default=CORPUS_DIR, help="directory for the corpus files")
+
+    run = commands.add_parser("run", help="run the solvers on a corpus")
+    run.add_argument("--corpus", default="single", help="'single', 'double' or a corpus file (default: %(default)s)")
+    run.add_argument("-a", "--algorithms", nargs="+", help="module names or labels (default: all of ALGORITHM_LIST)")
+    run.add_argument("-o", "--output", help="write the JSON results to this file")
+    run.add_argument("--seed", type=int, default=RUN_SEED, help="random seed set before every solve")
+    run.add_argument("--per-depth", type=int, help="use only the first N instances of each depth")
+    run.add_argument("--max-depth", type=int, help="skip instances deeper than this")
+    run.add_argument("--repeat", type=int, default=REPEAT,
+                     help="timed passes over the corpus; runs keep the median (default: %(default)s)")
+    run.add_argument("--bucket-width", type=int, default=BUCKET_WIDTH, help="depths per summary bucket")
+    run.add_argument("--time-limit", type=float, default=TIME_LIMIT, help="seconds allowed per solve (0: none)")
+    run.add_argument("--max-expansions", type=int, help="node expansions allowed per solve")
+    run.add_argument("--no-memory", action="store_true", help="skip the traced-memory pass")
+
+    compare = commands.add_parser("compare", help="flag regressions of a candidate run against a baseline run")
+    compare.add_argument("baseline", help="JSON results of the reference run")
+    compare.add_argument("candidate", help="JSON results of the run under test")
+    compare.add_argument("--alpha", type=float, default=0.05, help="significance level (default: %(default)s)")
+    compare.add_argument("--time-threshold", type=float, default=10.0, help="percent slowdown allowed (default: %(default)s)")
+    compare.add_argument("--expanded-threshold", type=float, default=5.0,
+                         help="percent more expansions allowed (default: %(default)s)")
+    compare.add_argument("--memory-threshold", type=float, default=10.0,
+                         help="percent more peak memory allowed (default: %(default)s)")
+    compare.add_argument("--bucket-width", type=int, help="depths per bucket (default: the baseline's)")
+    compare.add_argument("--all", action="store_true", help="list every bucket, not only flagged ones")
+    compare.add_argument("-o", "--output", help="write the comparison rows to this JSON file")
+    args = parser.parse_args(argv)
+
+    if args.command == "compare":
+        return _compare(args)
+
+    if args.command == "generate":
+        for corpus, file_name in CORPORA.items():
+            instances = generate_corpus(args.per_depth, corpus == "double", args.seed)
+            write_corpus(instances, os.path.join(args.output_dir, file_name))
+            print(f"{file_name}: {len(instances)} instances")
+        return 0
+
+    try:
+        algorithms = [resolve_algorithm(name) for name in args.algorithms] if args.algorithms \
+            else [module_name for _, module_name in ALGORITHM_LIST]
+    except ValueError as e:
+        parser.error(str(e))
+    instances = load_corpus(corpus_path(args.corpus), args.per_depth, args.max_depth)
+    budget = Budget(args.time_limit or None, args.max_expansions)
+    results = run_benchmark(instances, algorithms, args.seed, budget, args.repeat, not args.no_memory,
+                            args.bucket_width, progress=lambda message: print(message, file=sys.stderr))
+    results["meta"]["corpus"] = args.corpus
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            json.dump(results, output, indent=1)
+    print(format_table(results["summary"]))
+    return 0
+
+
+def _compare(args) -> int:
+    from .regression import REGRESSION, compare_results, format_comparison, load_results, mismatches
+    baseline, candidate = load_results(args.baseline), load_results(args.candidate)
+    for note in mismatches(baseline, candidate):
+        print(f"warning: {note}", file=sys.stderr)
+    thresholds = {"time": args.time_threshold, "expanded": args.expanded_threshold, "memory": args.memory_threshold}
+    try:
+        rows = compare_results(baseline, candidate, thresholds, args.alpha, args.bucket_width)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            json.dump(rows, output, indent=1)
+    print(format_comparison(rows, args.all))
+    regressions = sum(1 for row in rows if row["verdict"] == REGRESSION)
+    print(f"{regressions} regression(s) in {len(rows)} comparisons.")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,42 +1,35 @@
 from collections import deque
 
-def get_neighbors(state):
-    neighbors = []
-    s = list(state)
-    blank_index = s.index(9)
-    row, col = divmod(blank_index, 3)
-    moves = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-    for dr, dc in moves:
-        new_row = row + dr
-        new_col = col + dc
-        if 0 <= new_row < 3 and 0 <= new_col < 3:
-            new_index = new_row * 3 + new_col
-            new_s = s[:]
-            new_s[blank_index], new_s[new_index] = new_s[new_index], new_s[blank_index]
-            neighbors.append(tuple(new_s))
-    return neighbors
+from .budget import budgeted
+from .core import encode_state, get_code_neighbors
+from .ranking import StateIndexer
 
-def reconstruct_path(state, parent):
-    path = []
-    while state is not None:
-        path.append(state)
-        state = parent[state]
-    path.reverse()
-    return path
-
-def solve(start_state, goal_state):
+@budgeted
+def solve(start_state, goal_state, *, meter):
     """Solves the 8-puzzle using Breadth-First Search."""
-    queue = deque([start_state])
-    visited = set([start_state])
-    parent = {start_state: None}
+    meter.phase("setup")
+    n = len(start_state)
+    indexer = StateIndexer(n)
+    index = indexer.code_index
+    start_code = encode_state(start_state)
+    start = index(start_code)
+    goal = index(encode_state(goal_state))
+    parent = indexer.table('i', -1) # Rank of each discovered state's parent; start points to itself
+    parent[start] = start
+    queue = deque([(start, start_code, start_state.index(n))])
+    meter.phase("search")
     
     while queue:
-        current = queue.popleft()
-        if current == goal_state:
-            return reconstruct_path(current, parent)
-        for next_state in get_neighbors(current):
-            if next_state not in visited:
-                visited.add(next_state)
-                parent[next_state] = current
-                queue.append(next_state)
-    return None
\ No newline at end of file
+        current, code, blank_index = queue.popleft()
+        meter.tick(len(queue), meter.expanded + len(queue) + 1)  # every discovered state has a parent entry
+        if current == goal:
+            meter.phase("path")
+            return indexer.path(current, parent)
+        children = get_code_neighbors(code, blank_index, n)
+        meter.generated += len(children)
+        for next_code, next_blank in children:
+            next_rank = index(next_code)
+            if parent[next_rank] == -1:
+                parent[next_rank] = current
+                queue.append((next_rank, next_code, next_blank))
+    return None
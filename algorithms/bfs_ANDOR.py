@@ -1,61 +1,12 @@
 from collections import deque
-from typing import List, Tuple, Optional, Set, Dict
+from typing import List, Tuple, Optional
 
-State = Tuple[int, ...]
+from .budget import Meter, budgeted
+from .core import State, encode_state, get_code_neighbors, get_code_double_neighbors
+from .ranking import StateIndexer
 
-def get_neighbors_with_double_moves(state: State) -> List[State]:
-    """Generates neighbors with single and double moves, returns unique states."""
-    neighbors: Set[State] = set()
-    s_list = list(state)
-    try:
-        size = int(len(state)**0.5)
-        if size * size != len(state):
-             return []
-        blank_tile = size * size
-        blank_index = s_list.index(blank_tile)
-    except (ValueError, TypeError):
-        return []
-
-    row, col = divmod(blank_index, size)
-    moves = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-
-    single_move_intermediates: List[Tuple[State, int]] = []
-    for dr, dc in moves:
-        new_row, new_col = row + dr, col + dc
-        if 0 <= new_row < size and 0 <= new_col < size:
-            new_index = new_row * size + new_col
-            new_s = s_list[:]
-            new_s[blank_index], new_s[new_index] = new_s[new_index], new_s[blank_index]
-            neighbor_state = tuple(new_s)
-            neighbors.add(neighbor_state)
-            single_move_intermediates.append((neighbor_state, new_index))
-
-    for intermediate_state, intermediate_blank_index in single_move_intermediates:
-        s_intermediate = list(intermediate_state)
-        row1, col1 = divmod(intermediate_blank_index, size)
-        for dr, dc in moves:
-            new_row2, new_col2 = row1 + dr, col1 + dc
-            if 0 <= new_row2 < size and 0 <= new_col2 < size:
-                new_index2 = new_row2 * size + new_col2
-                if new_index2 == blank_index:
-                    continue
-                new_s2 = s_intermediate[:]
-                new_s2[intermediate_blank_index], new_s2[new_index2] = new_s2[new_index2], new_s2[intermediate_blank_index]
-                neighbor2_state = tuple(new_s2)
-                neighbors.add(neighbor2_state)
-    return list(neighbors)
-
-def reconstruct_path(state: State, parent: Dict[State, Optional[State]]) -> List[State]:
-    """Reconstructs path from goal to start."""
-    path: List[State] = []
-    current: Optional[State] = state
-    while current is not None:
-        path.append(current)
-        current = parent.get(current)
-    path.reverse()
-    return path
-
-def solve(start_state: State, goal_state: State) -> Optional[List[State]]:
+@budgeted
+def solve(start_state: State, goal_state: State, *, meter: Meter) -> Optional[List[State]]:
     """Solves 8-puzzle using BFS with double moves."""
     start_state = tuple(start_state)
     goal_state = tuple(goal_state)
@@ -63,17 +14,29 @@ def solve(start_state: State, goal_state: State) -> Optional[List[State]]:
     if start_state == goal_state:
         return [start_state]
 
-    queue: deque[State] = deque([start_state])
-    visited: Set[State] = {start_state}
-    parent: Dict[State, Optional[State]] = {start_state: None}
+    meter.phase("setup")
+    n = len(start_state)
+    indexer = StateIndexer(n)
+    index = indexer.code_index
+    start_code = encode_state(start_state)
+    start = index(start_code)
+    goal = index(encode_state(goal_state))
+    queue: deque[Tuple[int, int, int]] = deque([(start, start_code, start_state.index(n))])
+    parent = indexer.table('i', -1) # Parent rank of every discovered state; start points to itself
+    parent[start] = start
+    meter.phase("search")
 
     while queue:
-        current_state = queue.popleft()
-        for next_state in get_neighbors_with_double_moves(current_state):
-            if next_state not in visited:
-                visited.add(next_state)
-                parent[next_state] = current_state
-                queue.append(next_state)
-                if next_state == goal_state:
-                    return reconstruct_path(goal_state, parent)
-    return None
\ No newline at end of file
+        current, code, blank_index = queue.popleft()
+        meter.tick(len(queue), meter.expanded + len(queue) + 1)
+        successors = get_code_neighbors(code, blank_index, n) + get_code_double_neighbors(code, blank_index, n)
+        meter.generated += len(successors)
+        for next_code, next_blank in successors:
+            next_rank = index(next_code)
+            if parent[next_rank] == -1:
+                parent[next_rank] = current
+                queue.append((next_rank, next_code, next_blank))
+                if next_rank == goal:
+                    meter.phase("path")
+                    return indexer.path(goal, parent)
+    return None
@@ -0,0 +1,77 @@
+from typing import List, Optional
+
+from .budget import Meter, budgeted
+from .core import State, encode_state, get_code_neighbors, get_code_double_neighbors
+from .ranking import StateIndexer
+
+
+def search(start_state: State, goal_state: State, double_moves: bool = False,
+           meter: Optional[Meter] = None) -> Optional[List[State]]:
+    """Breadth-first search from both ends; every move (single or double) counts as one step.
+
+    Each round expands one whole layer of the smaller frontier. A state generated on
+    one side that the other side has already reached closes a path; the layer is
+    finished before stopping so the shortest of those joins is returned.
+    """
+    start_state = tuple(start_state); goal_state = tuple(goal_state)
+    meter = meter or Meter()
+    if start_state == goal_state:
+        return [start_state]
+    meter.phase("setup")
+    n = len(start_state)
+    indexer = StateIndexer(n)
+    index = indexer.code_index
+    start_code = encode_state(start_state); goal_code = encode_state(goal_state)
+    start = index(start_code); goal = index(goal_code)
+
+    # Per side: parent ranks (root points to itself), depth of every reached state, current layer.
+    parents = [indexer.table('i', -1), indexer.table('i', -1)]
+    depths = [indexer.table('B', 0), indexer.table('B', 0)]
+    parents[0][start] = start
+    parents[1][goal] = goal
+    layers = [[(start, start_code, start_state.index(n))], [(goal, goal_code, goal_state.index(n))]]
+    layer_depths = [0, 0]
+    discovered = 2
+    meter.phase("search")
+
+    while layers[0] and layers[1]:
+        side = 0 if len(layers[0]) <= len(layers[1]) else 1
+        parent = parents[side]; depth = depths[side]
+        other_parent = parents[1 - side]; other_depth = depths[1 - side]
+        next_depth = layer_depths[side] + 1
+        next_layer = []
+        meeting = -1
+        best = None
+        for current, code, blank_index in layers[side]:
+            meter.tick(len(layers[0]) + len(layers[1]) + len(next_layer), discovered)
+            successors = get_code_neighbors(code, blank_index, n)
+            if double_moves:
+                successors += get_code_double_neighbors(code, blank_index, n)
+            meter.generated += len(successors)
+            for next_code, next_blank in successors:
+                next_rank = index(next_code)
+                if parent[next_rank] != -1:
+                    continue
+                parent[next_rank] = current
+                depth[next_rank] = next_depth
+                if other_parent[next_rank] != -1:
+                    if best is None or other_depth[next_rank] < best:
+                        best = other_depth[next_rank]
+                        meeting = next_rank
+                next_layer.append((next_rank, next_code, next_blank))
+                discovered += 1
+        if meeting != -1:
+            meter.phase("path")
+            forward = indexer.path(meeting, parents[0])
+            backward = indexer.path(meeting, parents[1])
+            backward.reverse()
+            return forward + backward[1:]
+        layers[side] = next_layer
+        layer_depths[side] = next_depth
+    return None
+
+
+@budgeted
+def solve(start_state: State, goal_state: State, *, meter: Meter) -> Optional[List[State]]:
+    """Solves 8-puzzle using bidirectional BFS."""
+    return search(start_state, goal_state, meter=meter)
@@ -0,0 +1,10 @@
+from typing import List, Optional
+
+from .bidirectional_bfs import search
+from .budget import Meter, budgeted
+from .core import State
+
+@budgeted
+def solve(start_state: State, goal_state: State, *, meter: Meter) -> Optional[List[State]]:
+    """Solves 8-puzzle using bidirectional BFS with double moves."""
+    return search(start_state, goal_state, double_moves=True, meter=meter)
@@ -0,0 +1,190 @@
+"""Cooperative budgets and cancellation shared by every solve().
+
+Each solver accepts these keyword arguments, added by the ``budgeted`` decorator:
+
+* ``budget`` -- a Budget with an optional wall-clock limit (seconds), maximum
+  number of node expansions and maximum resident memory (MB);
+* ``cancel`` -- a CancellationToken (or anything with ``is_set()``, such as a
+  threading.Event or multiprocessing.Event) that another thread can set;
+* ``progress`` -- a callable that receives the Meter at every check, so a UI
+  running the solver in a worker thread can show the counters while it searches.
+
+The solver calls ``meter.tick()`` once per expansion in its main loop. Counting
+is a single comparison; the clock, memory and token are only consulted every
+CHECK_INTERVAL expansions. When a limit is hit, ``tick`` raises BudgetExceeded,
+which unwinds the search. The meter also collects the counters and phase timings
+of stats.SearchStats, which the decorator returns in place of the bare path --
+with status "budget_exceeded" and the partial counters when the budget ran out.
+"""
+import os
+import threading
+import time
+from functools import wraps
+from typing import Dict, NamedTuple, Optional
+
+from .stats import BUDGET_EXCEEDED, NOT_FOUND, PARTIAL, SOLVED, SearchStats
+
+CHECK_INTERVAL = 1024
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+class Budget(NamedTuple):
+    time: Optional[float] = None        # seconds of wall-clock time
+    expansions: Optional[int] = None    # node expansions
+    memory: Optional[float] = None      # MB of resident memory for the whole process
+
+
+class CancellationToken:
+    """Flag a caller sets to stop a running solver at its next check."""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    def is_set(self) -> bool:
+        return self._event.is_set()
+
+    cancelled = property(is_set)
+
+
+class BudgetExceeded(Exception):
+    """Raised by Meter.tick inside a solver; the budgeted wrapper turns it into a result."""
+
+    def __init__(self, reason: str):
+        super().__init__(f"budget exceeded: {reason}")
+        self.reason = reason        # "time", "expansions", "memory" or "cancelled"
+
+
+def resident_memory() -> Optional[float]:
+    """Current resident memory of this process in MB (peak RSS where /proc is missing), or None."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except (OSError, ValueError, AttributeError):
+        pass
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2 ** 20 if peak > 2 ** 32 else peak / 1024  # bytes on macOS, KB on Linux
+    return None
+
+
+class Meter:
+    """Collects search counters and enforces a Budget and a cancellation token.
+
+    Solvers bump ``generated``, ``evaluations`` and ``reexpanded`` directly, pass their
+    open and closed sizes to ``tick`` and name their phases with ``phase``.
+    """
+
+    def __init__(self, budget: Optional[Budget] = None, cancel=None, progress=None):
+        self.budget = budget or Budget()
+        self.cancel = cancel
+        self.progress = progress
+        self.expanded = 0
+        self.generated = 0
+        self.evaluations = 0
+        self.reexpanded = 0
+        self.peak_open = 0
+        self.peak_closed = 0
+        self.frontier = 0               # open and closed sizes at the last check
+        self.closed = 0
+        self.memory: Optional[float] = None
+        self.solver: Optional[str] = None  # set by solvers that delegate (portfolio)
+        self.phases: Dict[str, float] = {}
+        self.started = time.perf_counter()
+        self._phase = "search"          # until the solver names its first phase
+        self._phase_started = self.started
+        self._deadline = None if self.budget.time is None else self.started + self.budget.time
+        self._limited = (self.budget != Budget()) or cancel is not None or progress is not None
+        self._next_check = self._check_point()
+
+    def _check_point(self) -> float:
+        if not self._limited:
+            return float('inf')
+        point = self.expanded + CHECK_INTERVAL
+        if self.budget.expansions is not None:
+            point = min(point, self.budget.expansions)
+        return point
+
+    def tick(self, open_size: int = 0, closed_size: int = 0, count: int = 1) -> None:
+        """Records one expansion (``count`` for a batch); raises BudgetExceeded instead if a limit has been reached."""
+        if open_size > self.peak_open:
+            self.peak_open = open_size
+        if closed_size > self.peak_closed:
+            self.peak_closed = closed_size
+        if self.expanded >= self._next_check:
+            self.frontier = open_size
+            self.closed = closed_size
+            self.check()
+        self.expanded += count
+
+    def check(self) -> None:
+        """Checks every limit now (polling loops call this directly)."""
+        if not self._limited:
+            return
+        if self.progress is not None:
+            self.progress(self)
+        reason = None
+        if self.cancel is not None and self.cancel.is_set():
+            reason = "cancelled"
+        elif self.budget.expansions is not None and self.expanded >= self.budget.expansions:
+            reason = "expansions"
+        elif self._deadline is not None and time.perf_counter() >= self._deadline:
+            reason = "time"
+        elif self.budget.memory is not None:
+            self.memory = resident_memory()
+            if self.memory is not None and self.memory > self.budget.memory:
+                reason = "memory"
+        if reason:
+            raise BudgetExceeded(reason)
+        self._next_check = self._check_point()
+
+    def phase(self, name: str) -> None:
+        """Starts timing phase ``name``; the time since the previous call goes to the previous phase."""
+        now = time.perf_counter()
+        self.phases[self._phase] = self.phases.get(self._phase, 0.0) + now - self._phase_started
+        self._phase = name
+        self._phase_started = now
+
+    def result(self, path, goal_state, reason: Optional[str] = None) -> SearchStats:
+        """Closes the current phase (unnamed time counts as "search") and builds the SearchStats."""
+        self.phase("")
+        self.phases.pop("", None)
+        if reason is not None:
+            status, path = BUDGET_EXCEEDED, None
+        elif not path:
+            status, path = NOT_FOUND, None
+        else:
+            path = list(path)
+            status = SOLVED if tuple(path[-1]) == tuple(goal_state) else PARTIAL
+        return SearchStats(path, status, reason, self.expanded, self.generated, self.peak_open, self.peak_closed,
+                           self.evaluations, self.reexpanded, self.phases, time.perf_counter() - self.started,
+                           self.memory, solver=self.solver)
+
+    def remaining_time(self) -> Optional[float]:
+        """Seconds left before the deadline, or None without a time limit."""
+        return None if self._deadline is None else max(0.0, self._deadline - time.perf_counter())
+
+
+def budgeted(solve):
+    """Gives a solver ``budget``, ``cancel`` and ``progress`` keyword arguments and passes it a ``meter``.
+
+    The wrapped function receives ``meter=Meter(budget, cancel, progress)`` and returns a path or
+    None; the wrapper returns the meter's SearchStats for it instead, or, if the meter
+    raised BudgetExceeded, a "budget_exceeded" SearchStats with the partial counters.
+    """
+    @wraps(solve)
+    def wrapper(start_state, goal_state, *args, budget: Optional[Budget] = None, cancel=None,
+                progress=None, **kwargs) -> SearchStats:
+        meter = Meter(budget, cancel, progress)
+        try:
+            path = solve(start_state, goal_state, *args, meter=meter, **kwargs)
+        except BudgetExceeded as exceeded:
+            return meter.result(None, goal_state, exceeded.reason)
+        return meter.result(path, goal_state)
+    return wrapper
@@ -0,0 +1,93 @@
+"""LRU cache of solutions in front of solve().
+
+Entries are keyed by (algorithm, canonical start, canonical goal), where the
+canonical pair comes from relabel.canonicalize: the smallest form over the board's
+reflections and rotations and the tile relabeling that maps the goal onto a
+canonical goal. Mirror images, rotations and relabelings of a solved instance
+therefore hit the same entry, and the stored path is mapped back onto the board
+that was asked about. For optimal solvers that path is as short as a fresh one;
+for the others it is the path the solver found on the first equivalent board,
+which may differ from the one it would find on this exact board.
+
+Only solved results are stored; results stopped by a budget or cancellation, and
+partial or missing paths, always go to the solver again. The cache is safe to
+share between the UI thread and a solver thread.
+"""
+import importlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable
+
+from .core import State
+from .relabel import canonicalize
+from .stats import SOLVED, SearchStats
+
+DEFAULT_SIZE = 256
+# solve() keywords that steer one run and do not change its answer.
+CONTROL_KEYWORDS = frozenset({"budget", "cancel", "progress"})
+
+
+class SolutionCache:
+    """Bounded LRU mapping of canonical instances to SearchStats with canonical paths."""
+
+    def __init__(self, maxsize: int = DEFAULT_SIZE, use_symmetries: bool = True):
+        self.maxsize = maxsize
+        self.use_symmetries = use_symmetries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, SearchStats]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def info(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries), "maxsize": self.maxsize}
+
+    def solve(self, algorithm: str, start_state: State, goal_state: State, **kwargs) -> SearchStats:
+        """Returns the cached result for an equivalent instance, or runs ``algorithms.<algorithm>.solve``.
+
+        Keyword arguments are passed to the solver; apart from budget, cancel and
+        progress they are part of the key, and unhashable ones bypass the cache.
+        """
+        options = tuple(sorted((name, value) for name, value in kwargs.items() if name not in CONTROL_KEYWORDS))
+        try:
+            hash(options)
+        except TypeError:
+            return self._solver(algorithm)(start_state, goal_state, **kwargs)
+        start, goal, canonical = canonicalize(start_state, goal_state, self.use_symmetries)
+        key = (algorithm, start, goal, options)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+        if entry is not None:
+            return self._restored(entry, canonical.restore_path(entry.path))
+
+        result = self._solver(algorithm)(start_state, goal_state, **kwargs)
+        if result.status == SOLVED:
+            stored = self._restored(result, [canonical.apply(state) for state in result.path])
+            with self._lock:
+                self._entries[key] = stored
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return result
+
+    @staticmethod
+    def _solver(algorithm: str):
+        return importlib.import_module(f"algorithms.{algorithm}").solve
+
+    @staticmethod
+    def _restored(stats: SearchStats, path) -> SearchStats:
+        return SearchStats(path, stats.status, stats.reason, stats.expanded, stats.generated, stats.peak_open,
+                           stats.peak_closed, stats.evaluations, stats.reexpanded, dict(stats.phases),
+                           stats.elapsed, stats.memory, cached=True, solver=stats.solver)
@@ -0,0 +1,332 @@
+"""Shared puzzle core used by every solver in this package.
+
+Successor generation is driven by move tables precomputed once per board length:
+for each blank position they list the cells the blank can slide to in one move,
+and the (middle, destination) pairs reachable in a double move. States are plain
+tuples with the blank encoded as ``len(state)`` (9 on the 3x3 board), and can be
+packed into a compact integer code for cheap hashing in closed sets.
+"""
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+State = Tuple[int, ...]
+MoveTables = Tuple[Tuple[Tuple[int, ...], ...], Tuple[Tuple[Tuple[int, int], ...], ...]]
+
+MOVES = ((-1, 0), (1, 0), (0, -1), (0, 1))  # up, down, left, right
+MOVE_LETTERS = "UDLR"  # same order as MOVES
+
+
+@lru_cache(maxsize=None)
+def move_tables(length: int) -> Optional[MoveTables]:
+    """Returns (single, double) move tables for a board with ``length`` cells, or None if not square.
+
+    single[b] holds the cells the blank reaches from b in one slide; double[b] holds the
+    (middle, destination) pairs of two slides that do not bring the blank back to b.
+    """
+    size = int(round(length ** 0.5))
+    if size < 2 or size * size != length:
+        return None
+    single = []
+    for index in range(length):
+        row, col = divmod(index, size)
+        targets = []
+        for dr, dc in MOVES:
+            new_row, new_col = row + dr, col + dc
+            if 0 <= new_row < size and 0 <= new_col < size:
+                targets.append(new_row * size + new_col)
+        single.append(tuple(targets))
+    double = []
+    for index in range(length):
+        pairs = []
+        for middle in single[index]:
+            for destination in single[middle]:
+                if destination != index:
+                    pairs.append((middle, destination))
+        double.append(tuple(pairs))
+    return tuple(single), tuple(double)
+
+
+def board_size(state: State) -> int:
+    """Returns the side length of a square board, or 0 if the state is not square."""
+    tables = move_tables(len(state))
+    return int(round(len(state) ** 0.5)) if tables else 0
+
+
+def get_neighbors(state: State) -> List[State]:
+    """Generates all states reachable with one slide of the blank."""
+    n = len(state)
+    tables = move_tables(n)
+    if tables is None or n not in state:
+        return []
+    blank_index = state.index(n)
+    s = list(state)
+    neighbors = []
+    for j in tables[0][blank_index]:
+        s[blank_index] = s[j]; s[j] = n
+        neighbors.append(tuple(s))
+        s[j] = s[blank_index]; s[blank_index] = n
+    return neighbors
+
+
+def get_neighbor_moves(state: State) -> List[Tuple[State, int, int]]:
+    """Like get_neighbors, but yields (child, source, target): the tile at ``source`` slid into ``target``."""
+    n = len(state)
+    tables = move_tables(n)
+    if tables is None or n not in state:
+        return []
+    blank_index = state.index(n)
+    s = list(state)
+    moves = []
+    for j in tables[0][blank_index]:
+        s[blank_index] = s[j]; s[j] = n
+        moves.append((tuple(s), j, blank_index))
+        s[j] = s[blank_index]; s[blank_index] = n
+    return moves
+
+
+def get_double_neighbors(state: State) -> List[State]:
+    """Generates the states reachable with exactly two slides that do not undo each other."""
+    n = len(state)
+    tables = move_tables(n)
+    if tables is None or n not in state:
+        return []
+    b = state.index(n)
+    s = list(state)
+    neighbors = []
+    for m, d in tables[1][b]:
+        s[b] = s[m]; s[m] = s[d]; s[d] = n
+        neighbors.append(tuple(s))
+        s[d] = s[m]; s[m] = s[b]; s[b] = n
+    return neighbors
+
+
+def get_neighbors_with_double_moves(state: State) -> List[State]:
+    """Generates single-move neighbors followed by double-move neighbors.
+
+    The two groups never overlap (the blank ends on cells of different parity) and no
+    two double moves produce the same state, so the result needs no deduplication.
+    """
+    return get_neighbors(state) + get_double_neighbors(state)
+
+
+def get_neighbors_with_costs(state: State) -> List[Tuple[State, int]]:
+    """Generates neighbors with costs: 1 for single moves, 2 for double moves."""
+    return [(s, 1) for s in get_neighbors(state)] + [(s, 2) for s in get_double_neighbors(state)]
+
+
+# --- Compact integer codes ---
+
+@lru_cache(maxsize=None)
+def _code_layout(length: int) -> Tuple[int, int, Tuple[int, ...]]:
+    """Returns (bits per cell, cell mask, bit offset of every cell) for a board length."""
+    bits = length.bit_length()
+    return bits, (1 << bits) - 1, tuple(bits * i for i in range(length))
+
+
+def encode_state(state: State) -> int:
+    """Packs a state into one integer, ``bits`` per cell with cell 0 in the lowest bits."""
+    bits = _code_layout(len(state))[0]
+    code = 0
+    for tile in reversed(state):
+        code = (code << bits) | tile
+    return code
+
+
+def decode_state(code: int, length: int) -> State:
+    """Unpacks an integer produced by encode_state."""
+    bits, mask, _ = _code_layout(length)
+    tiles = []
+    for _ in range(length):
+        tiles.append(code & mask)
+        code >>= bits
+    return tuple(tiles)
+
+
+def get_code_neighbors(code: int, blank_index: int, length: int) -> List[Tuple[int, int]]:
+    """Generates (code, blank_index) pairs for the single-move neighbors of an encoded state.
+
+    Swapping the blank at b with tile t at j only changes two cells, so the child code is
+    ``code + (t - blank) * (2**offset[b] - 2**offset[j])`` and never needs unpacking.
+    """
+    _, mask, offsets = _code_layout(length)
+    b_shift = offsets[blank_index]
+    neighbors = []
+    for j in move_tables(length)[0][blank_index]:
+        j_shift = offsets[j]
+        tile = (code >> j_shift) & mask
+        neighbors.append((code + (tile - length) * ((1 << b_shift) - (1 << j_shift)), j))
+    return neighbors
+
+
+def get_code_double_neighbors(code: int, blank_index: int, length: int) -> List[Tuple[int, int]]:
+    """Generates (code, blank_index) pairs for the double-move neighbors of an encoded state."""
+    _, mask, offsets = _code_layout(length)
+    b_shift = offsets[blank_index]
+    neighbors = []
+    for m, d in move_tables(length)[1][blank_index]:
+        m_shift = offsets[m]; d_shift = offsets[d]
+        tile_m = (code >> m_shift) & mask
+        tile_d = (code >> d_shift) & mask
+        # b <- tile_m, m <- tile_d, d <- blank
+        child = (code + ((tile_m - length) << b_shift) + ((tile_d - tile_m) << m_shift)
+                 + ((length - tile_d) << d_shift))
+        neighbors.append((child, d))
+    return neighbors
+
+
+# --- Solvability ---
+
+def inversion_parity(state: State) -> int:
+    """Returns the parity (0/1) of the number of inversions among the non-blank tiles."""
+    n = len(state)
+    tiles = [t for t in state if t != n]
+    inversions = 0
+    for i, tile in enumerate(tiles):
+        for other in tiles[i + 1:]:
+            if other < tile:
+                inversions += 1
+    return inversions & 1
+
+
+def is_solvable(state: State, goal_state: State) -> bool:
+    """Checks whether ``goal_state`` is reachable from ``state`` on any NxN board.
+
+    Every slide keeps the tile inversion parity on odd widths; on even widths a vertical
+    slide flips it and moves the blank one row, so inversions + blank row is invariant.
+    """
+    state = tuple(state); goal_state = tuple(goal_state)
+    n = len(state)
+    size = board_size(state)
+    if not size or len(goal_state) != n or sorted(state) != list(range(1, n + 1)) or sorted(goal_state) != sorted(state):
+        return False
+    state_parity = inversion_parity(state)
+    goal_parity = inversion_parity(goal_state)
+    if size % 2 == 0:
+        state_parity ^= (state.index(n) // size) & 1
+        goal_parity ^= (goal_state.index(n) // size) & 1
+    return state_parity == goal_parity
+
+
+# --- Heuristics and path helpers ---
+
+@lru_cache(maxsize=64)
+def goal_positions(goal_state: State) -> Dict[int, Tuple[int, int]]:
+    """Maps every tile of the goal to its (row, col) cell."""
+    size = board_size(goal_state)
+    return {tile: divmod(i, size) for i, tile in enumerate(goal_state)} if size else {}
+
+
+def manhattan_distance(state: State, goal_state: State) -> int:
+    """Calculates the Manhattan distance heuristic (inf if the states are incompatible)."""
+    n = len(state)
+    size = board_size(state)
+    if not size or len(goal_state) != n:
+        return float('inf')
+    positions = goal_positions(tuple(goal_state))
+    total = 0
+    for i, tile in enumerate(state):
+        if tile != n:
+            goal_pos = positions.get(tile)
+            if goal_pos is None:
+                return float('inf')
+            row, col = divmod(i, size)
+            total += abs(row - goal_pos[0]) + abs(col - goal_pos[1])
+    return total
+
+
+@lru_cache(maxsize=64)
+def manhattan_deltas(goal_state: State) -> Tuple[Tuple[Tuple[int, ...], ...], ...]:
+    """Returns delta[tile][source][target]: the change in Manhattan distance when ``tile`` slides.
+
+    One slide moves one tile by one cell, so a child's distance is its parent's plus a
+    single lookup (always +1 or -1 for adjacent cells; the blank's row is all zeros).
+    """
+    n = len(goal_state)
+    size = board_size(goal_state)
+    positions = goal_positions(goal_state)
+    cells = [divmod(i, size) for i in range(n)]
+    delta = []
+    for tile in range(n + 1):
+        if tile == n or tile not in positions:
+            delta.append(tuple((0,) * n for _ in range(n)))
+            continue
+        goal_row, goal_col = positions[tile]
+        cost = [abs(row - goal_row) + abs(col - goal_col) for row, col in cells]
+        delta.append(tuple(tuple(cost[target] - cost[source] for target in range(n)) for source in range(n)))
+    return tuple(delta)
+
+
+def get_scored_neighbors(state: State, h: int, goal_state: State) -> List[Tuple[State, int]]:
+    """Single-move neighbors paired with their Manhattan distance, updated from the parent's ``h``."""
+    n = len(state)
+    tables = move_tables(n)
+    if tables is None or n not in state:
+        return []
+    delta = manhattan_deltas(goal_state)
+    b = state.index(n)
+    s = list(state)
+    neighbors = []
+    for j in tables[0][b]:
+        tile = s[j]
+        s[b] = tile; s[j] = n
+        neighbors.append((tuple(s), h + delta[tile][j][b]))
+        s[j] = tile; s[b] = n
+    return neighbors
+
+
+def get_scored_double_neighbors(state: State, h: int, goal_state: State) -> List[Tuple[State, int]]:
+    """Double-move neighbors paired with their Manhattan distance (two tiles move, two lookups)."""
+    n = len(state)
+    tables = move_tables(n)
+    if tables is None or n not in state:
+        return []
+    delta = manhattan_deltas(goal_state)
+    b = state.index(n)
+    s = list(state)
+    neighbors = []
+    for m, d in tables[1][b]:
+        tile_m = s[m]; tile_d = s[d]
+        s[b] = tile_m; s[m] = tile_d; s[d] = n
+        neighbors.append((tuple(s), h + delta[tile_m][m][b] + delta[tile_d][d][m]))
+        s[d] = tile_d; s[m] = tile_m; s[b] = n
+    return neighbors
+
+
+def get_scored_neighbors_with_double_moves(state: State, h: int, goal_state: State) -> List[Tuple[State, int]]:
+    """Scored single-move neighbors followed by scored double-move neighbors."""
+    return get_scored_neighbors(state, h, goal_state) + get_scored_double_neighbors(state, h, goal_state)
+
+
+def reconstruct_path(state, parent: Dict) -> List:
+    """Follows parent links from ``state`` back to the root and returns the path root-first."""
+    path = []
+    current = state
+    while current is not None:
+        path.append(current)
+        current = parent.get(current)
+    path.reverse()
+    return path
+
+
+def move_string(path: List[State]) -> str:
+    """Spells a path as the blank's moves (U, D, L, R); a double move contributes two letters.
+
+    Raises ValueError if two consecutive states are not one single or double move apart.
+    """
+    letters = []
+    for state, child in zip(path, path[1:]):
+        n = len(state)
+        size = board_size(state)
+        blank = state.index(n); target = child.index(n)
+        single, double = move_tables(n)
+        if target in single[blank]:
+            cells = [blank, target]
+        else:
+            middles = [m for m, d in double[blank] if d == target and child[blank] == state[m] and child[m] == state[d]]
+            if not middles:
+                raise ValueError(f"{child} is not one move away from {state}.")
+            cells = [blank, middles[0], target]
+        for source, destination in zip(cells, cells[1:]):
+            (row, col), (new_row, new_col) = divmod(source, size), divmod(destination, size)
+            letters.append(MOVE_LETTERS[MOVES.index((new_row - row, new_col - col))])
+    return "".join(letters)
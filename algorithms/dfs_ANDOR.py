@@ -1,60 +1,11 @@
-from typing import List, Tuple, Optional, Set, Dict
+from typing import List, Tuple, Optional, Dict
 
-State = Tuple[int, ...]
+from .budget import Meter, budgeted
+from .core import (State, encode_state, decode_state, get_code_neighbors,
+                   get_code_double_neighbors, reconstruct_path)
 
-def get_neighbors_with_double_moves(state: State) -> List[State]:
-    """Generates neighbors with single and double moves, returns unique states."""
-    neighbors: Set[State] = set()
-    s_list = list(state)
-    try:
-        size = int(len(state)**0.5)
-        if size * size != len(state):
-             return []
-        blank_tile = size * size
-        blank_index = s_list.index(blank_tile)
-    except (ValueError, TypeError):
-        return []
-
-    row, col = divmod(blank_index, size)
-    moves = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-
-    single_move_intermediates: List[Tuple[State, int]] = []
-    for dr, dc in moves:
-        new_row, new_col = row + dr, col + dc
-        if 0 <= new_row < size and 0 <= new_col < size:
-            new_index = new_row * size + new_col
-            new_s = s_list[:]
-            new_s[blank_index], new_s[new_index] = new_s[new_index], new_s[blank_index]
-            neighbor_state = tuple(new_s)
-            neighbors.add(neighbor_state)
-            single_move_intermediates.append((neighbor_state, new_index))
-
-    for intermediate_state, intermediate_blank_index in single_move_intermediates:
-        s_intermediate = list(intermediate_state)
-        row1, col1 = divmod(intermediate_blank_index, size)
-        for dr, dc in moves:
-            new_row2, new_col2 = row1 + dr, col1 + dc
-            if 0 <= new_row2 < size and 0 <= new_col2 < size:
-                new_index2 = new_row2 * size + new_col2
-                if new_index2 == blank_index:
-                    continue
-                new_s2 = s_intermediate[:]
-                new_s2[intermediate_blank_index], new_s2[new_index2] = new_s2[new_index2], new_s2[intermediate_blank_index]
-                neighbor2_state = tuple(new_s2)
-                neighbors.add(neighbor2_state)
-    return list(neighbors)
-
-def reconstruct_path(state: State, parent: Dict[State, Optional[State]]) -> List[State]:
-    """Reconstructs path from goal to start."""
-    path: List[State] = []
-    current: Optional[State] = state
-    while current is not None:
-        path.append(current)
-        current = parent.get(current)
-    path.reverse()
-    return path
-
-def solve(start_state: State, goal_state: State) -> Optional[List[State]]:
+@budgeted
+def solve(start_state: State, goal_state: State, *, meter: Meter) -> Optional[List[State]]:
     """Solves 8-puzzle using DFS with double moves."""
     start_state = tuple(start_state)
     goal_state = tuple(goal_state)
@@ -62,28 +13,31 @@ def solve(start_state: State, goal_state: State) -> Optional[List[State]]:
     if start_state == goal_state:
         return [start_state]
 
-    stack: List[State] = [start_state]
-    visited: Set[State] = {start_state}
-    parent: Dict[State, Optional[State]] = {start_state: None}
+    n = len(start_state)
+    start = encode_state(start_state)
+    goal = encode_state(goal_state)
+    stack: List[Tuple[int, int]] = [(start, start_state.index(n))]
+    parent: Dict[int, Optional[int]] = {start: None}
     MAX_DEPTH = 50
-    depth_map: Dict[State, int] = {start_state: 0}
+    depth_map: Dict[int, int] = {start: 0}
 
     while stack:
-        current_state = stack.pop()
-        if current_state == goal_state:
-            return reconstruct_path(goal_state, parent)
+        current, blank_index = stack.pop()
+        meter.tick(len(stack), len(parent))
+        if current == goal:
+            meter.phase("path")
+            return [decode_state(code, n) for code in reconstruct_path(goal, parent)]
 
-        current_depth = depth_map[current_state]
+        current_depth = depth_map[current]
         if current_depth >= MAX_DEPTH:
             continue
-            
-      
-        neighbors = get_neighbors_with_double_moves(current_state)
-     
-        for next_state in neighbors:
-            if next_state not in visited:
-                visited.add(next_state)
-                parent[next_state] = current_state
-                depth_map[next_state] = current_depth + 1
-                stack.append(next_state)
+
+        successors = get_code_neighbors(current, blank_index, n) + get_code_double_neighbors(current, blank_index, n)
+        meter.generated += len(successors)
+
+        for next_code, next_blank in successors:
+            if next_code not in parent:
+                parent[next_code] = current
+                depth_map[next_code] = current_depth + 1
+                stack.append((next_code, next_blank))
     return None
\ No newline at end of file
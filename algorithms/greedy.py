@@ -1,57 +1,41 @@
-from heapq import heappush, heappop
+from .budget import budgeted
+from .core import get_neighbor_moves, reconstruct_path
+from .heuristics import bind_heuristic
+from .open_list import make_open_list
 
-def manhattan_distance(state, goal_state):
-    total = 0
-    for i in range(9):
-        if state[i] != 9:
-            curr_row, curr_col = divmod(i, 3)
-            goal_pos = goal_state.index(state[i])
-            goal_row, goal_col = divmod(goal_pos, 3)
-            total += abs(curr_row - goal_row) + abs(curr_col - goal_col)
-    return total
+@budgeted
+def solve(start_state, goal_state, heuristic="manhattan", open_list="bucket", *, meter):
+    """Solves the 8-puzzle using Greedy Best-First Search (Manhattan distance by default).
 
-def get_neighbors(state):
-    neighbors = []
-    s = list(state)
-    blank_index = s.index(9)
-    row, col = divmod(blank_index, 3)
-    moves = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-    for dr, dc in moves:
-        new_row = row + dr
-        new_col = col + dc
-        if 0 <= new_row < 3 and 0 <= new_col < 3:
-            new_index = new_row * 3 + new_col
-            new_s = s[:]
-            new_s[blank_index], new_s[new_index] = new_s[new_index], new_s[blank_index]
-            neighbors.append(tuple(new_s))
-    return neighbors
-
-def reconstruct_path(state, parent):
-    path = []
-    while state is not None:
-        path.append(state)
-        state = parent[state]
-    path.reverse()
-    return path
-
-def solve(start_state, goal_state):
-    """Solves the 8-puzzle using Greedy Best-First Search with Manhattan distance."""
-    pq = [(manhattan_distance(start_state, goal_state), start_state)]
+    Among nodes with equal h the shallowest is expanded first, which keeps paths short.
+    """
+    meter.phase("setup")
+    h = bind_heuristic(heuristic, goal_state)
+    h_start, extra = h.evaluate(start_state)
+    meter.evaluations += 1
+    pq = make_open_list(open_list, tie_break="low") # h -> (state, extra), ties by lowest depth
+    pq.push(h_start, (start_state, extra), 0)
     parent = {start_state: None}
     visited = set() # For Greedy, visited means expanded
+    meter.phase("search")
     
     while pq:
-        _, current = heappop(pq)
+        h_current, depth, (current, extra) = pq.pop()
         if current == goal_state:
+            meter.phase("path")
             return reconstruct_path(current, parent)
         if current in visited:
             continue
         visited.add(current)
-        for next_state in get_neighbors(current):
+        meter.tick(len(pq), len(visited))
+        children = get_neighbor_moves(current)
+        meter.generated += len(children)
+        for next_state, source, target in children:
             # In pure Greedy, we don't check if already in pq with better h,
             # we just add. Visited set prevents cycles and re-expansion.
             if next_state not in visited: 
-                h_value = manhattan_distance(next_state, goal_state)
+                h_value, next_extra = h.update(current, next_state, h_current, extra, source, target)
+                meter.evaluations += 1
                 parent[next_state] = current
-                heappush(pq, (h_value, next_state))
+                pq.push(h_value, (next_state, next_extra), depth + 1)
     return None
\ No newline at end of file
@@ -0,0 +1,379 @@
+"""Heuristic registry: solvers take ``heuristic=`` as a name from HEURISTICS or a callable.
+
+Plain heuristics are functions ``h(state, goal_state)``. Search loops instead bind a
+heuristic to their goal with ``bind_heuristic`` and get an IncrementalHeuristic:
+``evaluate(state)`` computes ``(value, extra)`` once for the root, and
+``update(parent, child, value, extra, source, target)`` derives the child's pair
+from the parent's after the tile at ``source`` slid into ``target``. Searches that
+mutate one board in place call ``slide(board, value, extra, source, target)``
+instead, after the slide has been applied to ``board``. ``extra`` is
+whatever auxiliary key a heuristic carries between nodes; it is always a plain
+comparable value fixed by the state, so it can sit inside heap items.
+"""
+import time
+from collections import deque
+from functools import lru_cache
+from typing import Callable, Dict, List, Sequence, Tuple, Union
+
+from .core import State, board_size, goal_positions, manhattan_deltas, manhattan_distance
+from .pattern_db import pdb_distance
+
+Heuristic = Callable[[State, State], int]
+
+
+class IncrementalHeuristic:
+    """A heuristic bound to one goal. The default update simply re-evaluates the child."""
+
+    def __init__(self, goal_state: State):
+        self.goal = tuple(goal_state)
+
+    def evaluate(self, state: State) -> Tuple[int, object]:
+        raise NotImplementedError
+
+    def update(self, parent: State, child: State, value: int, extra, source: int, target: int) -> Tuple[int, object]:
+        return self.evaluate(child)
+
+    def slide(self, board: List[int], value: int, extra, source: int, target: int) -> Tuple[int, object]:
+        child = tuple(board)
+        parent = list(board)
+        parent[source], parent[target] = board[target], board[source]
+        return self.update(tuple(parent), child, value, extra, source, target)
+
+
+class FunctionHeuristic(IncrementalHeuristic):
+    """Wraps a plain ``h(state, goal_state)`` function."""
+
+    def __init__(self, function: Heuristic, goal_state: State):
+        super().__init__(goal_state)
+        self.function = function
+
+    def evaluate(self, state: State) -> Tuple[int, object]:
+        return self.function(state, self.goal), 0
+
+
+class ManhattanHeuristic(IncrementalHeuristic):
+    """Manhattan distance, updated with one core.manhattan_deltas lookup per slide."""
+
+    def __init__(self, goal_state: State):
+        super().__init__(goal_state)
+        self.delta = manhattan_deltas(self.goal)
+
+    def evaluate(self, state: State) -> Tuple[int, object]:
+        return manhattan_distance(state, self.goal), 0
+
+    def update(self, parent, child, value, extra, source, target):
+        return value + self.delta[parent[source]][source][target], 0
+
+    def slide(self, board, value, extra, source, target):
+        return value + self.delta[board[target]][source][target], 0
+
+
+# --- Linear conflict ---
+
+@lru_cache(maxsize=None)
+def _line_conflicts(goal_lines: Tuple[int, ...]) -> int:
+    """Tiles to remove from a line so its own tiles (goal index >= 0) appear in goal order.
+
+    Each removed tile must leave the line and come back, adding 2 moves to Manhattan.
+    """
+    targets = [t for t in goal_lines if t >= 0]
+    longest = [1] * len(targets)
+    for i in range(len(targets)):
+        for j in range(i):
+            if targets[j] < targets[i] and longest[j] + 1 > longest[i]:
+                longest[i] = longest[j] + 1
+    return len(targets) - max(longest, default=0)
+
+
+class LinearConflictHeuristic(IncrementalHeuristic):
+    """Manhattan distance plus 2 per tile that must leave its row or column to pass another.
+
+    A horizontal slide keeps the order of every row, so only the two columns the tile
+    leaves and enters need rescanning (and the two rows for a vertical slide).
+    """
+
+    def __init__(self, goal_state: State):
+        super().__init__(goal_state)
+        n = len(self.goal)
+        self.size = size = board_size(self.goal)
+        positions = goal_positions(self.goal)
+        self.goal_row = [-1] * (n + 1)
+        self.goal_col = [-1] * (n + 1)
+        for tile, (row, col) in positions.items():
+            if tile != n:
+                self.goal_row[tile] = row
+                self.goal_col[tile] = col
+        # row_keys[r][tile]: the tile's goal column if its goal row is r, else -1 (and vice versa).
+        self.row_keys = [[self.goal_col[t] if self.goal_row[t] == r else -1 for t in range(n + 1)] for r in range(size)]
+        self.col_keys = [[self.goal_row[t] if self.goal_col[t] == c else -1 for t in range(n + 1)] for c in range(size)]
+
+    def _row(self, state: State, row: int) -> int:
+        keys = self.row_keys[row]
+        return _line_conflicts(tuple([keys[t] for t in state[row * self.size:(row + 1) * self.size]]))
+
+    def _col(self, state: State, col: int) -> int:
+        keys = self.col_keys[col]
+        return _line_conflicts(tuple([keys[t] for t in state[col::self.size]]))
+
+    def evaluate(self, state: State) -> Tuple[int, object]:
+        size = self.size
+        total = 0
+        for i, tile in enumerate(state):
+            if self.goal_row[tile] >= 0:
+                row, col = divmod(i, size)
+                total += abs(row - self.goal_row[tile]) + abs(col - self.goal_col[tile])
+        conflicts = sum(self._row(state, r) + self._col(state, r) for r in range(size))
+        return total + 2 * conflicts, 0
+
+    def update(self, parent, child, value, extra, source, target):
+        return self._moved(parent, child, parent[source], value, source, target), 0
+
+    def slide(self, board, value, extra, source, target):
+        # Rescan the touched lines on the board itself, undoing the slide for the "before" counts.
+        after = self._moved(None, board, board[target], value, source, target)
+        board[source], board[target] = board[target], board[source]
+        before = self._lines(board, source, target)
+        board[source], board[target] = board[target], board[source]
+        return after - 2 * before, 0
+
+    def _lines(self, state, source: int, target: int) -> int:
+        """Conflicts in the two lines a slide between ``source`` and ``target`` can change."""
+        size = self.size
+        if source // size != target // size:
+            return self._row(state, source // size) + self._row(state, target // size)
+        return self._col(state, source % size) + self._col(state, target % size)
+
+    def _moved(self, parent, child, tile: int, value: int, source: int, target: int) -> int:
+        size = self.size
+        source_row, source_col = divmod(source, size)
+        target_row, target_col = divmod(target, size)
+        goal_row = self.goal_row[tile]; goal_col = self.goal_col[tile]
+        value += (abs(target_row - goal_row) + abs(target_col - goal_col)
+                  - abs(source_row - goal_row) - abs(source_col - goal_col))
+        value += 2 * self._lines(child, source, target)
+        if parent is not None:
+            value -= 2 * self._lines(parent, source, target)
+        return value
+
+
+@lru_cache(maxsize=64)
+def _bound(cls, goal_state: State) -> IncrementalHeuristic:
+    return cls(goal_state)
+
+
+def linear_conflict(state: State, goal_state: State) -> int:
+    """Manhattan distance plus linear conflicts."""
+    return _bound(LinearConflictHeuristic, tuple(goal_state)).evaluate(tuple(state))[0]
+
+
+# --- Walking distance ---
+
+@lru_cache(maxsize=None)
+def _walking_tables(size: int, blank_line: int) -> Tuple[Dict[Tuple[Tuple[int, ...], ...], int], List[int], List[Tuple]]:
+    """BFS over line-occupancy matrices for one axis of a board.
+
+    matrix[line][g] counts tiles in ``line`` whose goal line is ``g``; the blank sits in
+    the line holding size-1 tiles. Returns (matrix -> id, distance per id, transitions)
+    where transitions[id][toward][g] is the id after a tile with goal line g slides
+    into the blank's line from the line below (toward=0) or above (toward=1).
+    """
+    goal = tuple(tuple((size - 1 if line == blank_line else size) if g == line else 0 for g in range(size))
+                 for line in range(size))
+    ids = {goal: 0}
+    matrices = [goal]
+    distances = [0]
+    queue = deque([goal])
+    while queue:
+        matrix = queue.popleft()
+        blank = next(line for line in range(size) if sum(matrix[line]) == size - 1)
+        for other in (blank + 1, blank - 1):
+            if not 0 <= other < size:
+                continue
+            for g in range(size):
+                if matrix[other][g]:
+                    rows = [list(row) for row in matrix]
+                    rows[other][g] -= 1; rows[blank][g] += 1
+                    moved = tuple(tuple(row) for row in rows)
+                    if moved not in ids:
+                        ids[moved] = len(matrices)
+                        matrices.append(moved)
+                        distances.append(distances[ids[matrix]] + 1)
+                        queue.append(moved)
+    transitions = []
+    for matrix in matrices:
+        blank = next(line for line in range(size) if sum(matrix[line]) == size - 1)
+        per_side = []
+        for other in (blank + 1, blank - 1):
+            moves = []
+            for g in range(size):
+                if 0 <= other < size and matrix[other][g]:
+                    rows = [list(row) for row in matrix]
+                    rows[other][g] -= 1; rows[blank][g] += 1
+                    moves.append(ids[tuple(tuple(row) for row in rows)])
+                else:
+                    moves.append(-1)
+            per_side.append(tuple(moves))
+        transitions.append(tuple(per_side))
+    return ids, distances, transitions
+
+
+MAX_WALKING_SIZE = 4  # 24,964 matrices on 4x4; the 5x5 tables do not fit a pure-Python BFS
+
+
+class WalkingDistanceHeuristic(IncrementalHeuristic):
+    """Walking distance: vertical and horizontal moves counted on tile-occupancy matrices.
+
+    ``extra`` is the pair of matrix ids; a slide moves one tile between two adjacent
+    lines of one axis, so the child's ids come from a transition table lookup.
+    """
+
+    def __init__(self, goal_state: State):
+        super().__init__(goal_state)
+        n = len(self.goal)
+        self.size = size = board_size(self.goal)
+        if size > MAX_WALKING_SIZE:
+            raise ValueError(f"Walking distance supports boards up to {MAX_WALKING_SIZE}x{MAX_WALKING_SIZE}.")
+        positions = goal_positions(self.goal)
+        blank_row, blank_col = positions[n]
+        self.goal_row = [0] * (n + 1)
+        self.goal_col = [0] * (n + 1)
+        for tile, (row, col) in positions.items():
+            self.goal_row[tile] = row
+            self.goal_col[tile] = col
+        self.row_ids, self.row_distances, self.row_moves = _walking_tables(size, blank_row)
+        self.col_ids, self.col_distances, self.col_moves = _walking_tables(size, blank_col)
+
+    def evaluate(self, state: State) -> Tuple[int, object]:
+        n = len(state)
+        size = self.size
+        rows = [[0] * size for _ in range(size)]
+        cols = [[0] * size for _ in range(size)]
+        for i, tile in enumerate(state):
+            if tile != n:
+                row, col = divmod(i, size)
+                rows[row][self.goal_row[tile]] += 1
+                cols[col][self.goal_col[tile]] += 1
+        row_id = self.row_ids[tuple(map(tuple, rows))]
+        col_id = self.col_ids[tuple(map(tuple, cols))]
+        return self.row_distances[row_id] + self.col_distances[col_id], (row_id, col_id)
+
+    def update(self, parent, child, value, extra, source, target):
+        return self._moved(parent[source], extra, source, target)
+
+    def slide(self, board, value, extra, source, target):
+        return self._moved(board[target], extra, source, target)
+
+    def _moved(self, tile: int, extra, source: int, target: int) -> Tuple[int, object]:
+        row_id, col_id = extra
+        if source - target == self.size:
+            row_id = self.row_moves[row_id][0][self.goal_row[tile]]
+        elif target - source == self.size:
+            row_id = self.row_moves[row_id][1][self.goal_row[tile]]
+        elif source > target:
+            col_id = self.col_moves[col_id][0][self.goal_col[tile]]
+        else:
+            col_id = self.col_moves[col_id][1][self.goal_col[tile]]
+        return self.row_distances[row_id] + self.col_distances[col_id], (row_id, col_id)
+
+
+def walking_distance(state: State, goal_state: State) -> int:
+    """Walking distance heuristic."""
+    return _bound(WalkingDistanceHeuristic, tuple(goal_state)).evaluate(tuple(state))[0]
+
+
+# --- Registry ---
+
+HEURISTICS: Dict[str, Heuristic] = {
+    "manhattan": manhattan_distance,
+    "linear_conflict": linear_conflict,
+    "walking_distance": walking_distance,
+    "pdb": pdb_distance,
+}
+
+_INCREMENTAL = {
+    "manhattan": ManhattanHeuristic,
+    "linear_conflict": LinearConflictHeuristic,
+    "walking_distance": WalkingDistanceHeuristic,
+}
+
+
+def get_heuristic(heuristic: Union[str, Heuristic]) -> Heuristic:
+    """Resolves a heuristic name (or passes a callable through)."""
+    if callable(heuristic):
+        return heuristic
+    try:
+        return HEURISTICS[heuristic]
+    except KeyError:
+        raise ValueError(f"Unknown heuristic '{heuristic}'. Available: {', '.join(HEURISTICS)}.") from None
+
+
+def bind_heuristic(heuristic, goal_state: State) -> IncrementalHeuristic:
+    """Returns an IncrementalHeuristic for ``goal_state`` from a name, a function or a bound heuristic."""
+    if isinstance(heuristic, IncrementalHeuristic):
+        return heuristic
+    if isinstance(heuristic, str) and heuristic in _INCREMENTAL:
+        return _bound(_INCREMENTAL[heuristic], tuple(goal_state))
+    return FunctionHeuristic(get_heuristic(heuristic), tuple(goal_state))
+
+
+class CountingHeuristic(IncrementalHeuristic):
+    """Delegates to another bound heuristic and counts evaluations (one per generated node)."""
+
+    def __init__(self, inner: IncrementalHeuristic):
+        super().__init__(inner.goal)
+        self.inner = inner
+        self.calls = 0
+
+    def evaluate(self, state):
+        self.calls += 1
+        return self.inner.evaluate(state)
+
+    def update(self, parent, child, value, extra, source, target):
+        self.calls += 1
+        return self.inner.update(parent, child, value, extra, source, target)
+
+    def slide(self, board, value, extra, source, target):
+        self.calls += 1
+        return self.inner.slide(board, value, extra, source, target)
+
+
+def compare_heuristics(instances: Sequence[Tuple[State, State]], solver_name: str = "ida_star",
+                       heuristics: Sequence[str] = ("manhattan", "pdb")) -> Dict[str, List[Tuple[int, int, float]]]:
+    """Solves each (start, goal) instance with every heuristic.
+
+    Returns (nodes expanded, heuristic evaluations, seconds) per run; expansions come
+    from the solver's SearchStats, evaluations from a CountingHeuristic.
+    """
+    import importlib
+    solver = importlib.import_module(f".{solver_name}", __package__)
+    results: Dict[str, List[Tuple[int, int, float]]] = {name: [] for name in heuristics}
+    for start_state, goal_state in instances:
+        for name in heuristics:
+            counter = CountingHeuristic(bind_heuristic(name, goal_state))
+            start_time = time.time()
+            stats = solver.solve(start_state, goal_state, heuristic=counter)
+            results[name].append((stats.expanded, counter.calls, time.time() - start_time))
+    return results
+
+
+if __name__ == '__main__':
+    import random
+    from .core import is_solvable
+    # Run through the package module so the solvers and this script share one copy of the classes.
+    from .heuristics import HEURISTICS, compare_heuristics
+
+    goal = (1, 2, 3, 4, 5, 6, 7, 8, 9)
+    rng = random.Random(0)
+    instances = []
+    while len(instances) < 5:
+        tiles = list(goal)
+        rng.shuffle(tiles)
+        if is_solvable(tuple(tiles), goal):
+            instances.append((tuple(tiles), goal))
+    names = tuple(HEURISTICS)
+    for solver_name in ("a_star", "ida_star"):
+        results = compare_heuristics(instances, solver_name, names)
+        print(f"{solver_name}: {'heuristic':<18}{'expanded':>12}{'evaluations':>12}{'seconds':>10}")
+        for name in names:
+            print(f"{'':<{len(solver_name) + 2}}{name:<18}{sum(e for e, _, _ in results[name]):>12}"
+                  f"{sum(c for _, c, _ in results[name]):>12}{sum(t for _, _, t in results[name]):>10.3f}")
@@ -1,45 +1,10 @@
 import random
 
-def manhattan_distance(state, goal_state):
-    total = 0
-    for i in range(9):
-        if state[i] != 9:
-            curr_row, curr_col = divmod(i, 3)
-            goal_pos = goal_state.index(state[i])
-            goal_row, goal_col = divmod(goal_pos, 3)
-            total += abs(curr_row - goal_row) + abs(curr_col - goal_col)
-    return total
+from .budget import budgeted
+from .core import manhattan_distance, get_scored_neighbors, is_solvable
 
-def get_neighbors(state):
-    neighbors = []
-    s = list(state)
-    blank_index = s.index(9)
-    row, col = divmod(blank_index, 3)
-    moves = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-    for dr, dc in moves:
-        new_row = row + dr
-        new_col = col + dc
-        if 0 <= new_row < 3 and 0 <= new_col < 3:
-            new_index = new_row * 3 + new_col
-            new_s = s[:]
-            new_s[blank_index], new_s[new_index] = new_s[new_index], new_s[blank_index]
-            neighbors.append(tuple(new_s))
-    return neighbors
-
-def is_solvable(state, goal_state=(1, 2, 3, 4, 5, 6, 7, 8, 9)):
-    state_list = [x for x in state if x != 9]
-    inversions = 0
-    for i in range(len(state_list)):
-        for j in range(i + 1, len(state_list)):
-            if state_list[i] > state_list[j]:
-                inversions += 1
-    blank_row_state = state.index(9) // 3
-    blank_row_goal = goal_state.index(9) // 3
-    parity_state = inversions % 2
-    parity_blank = (blank_row_state - blank_row_goal) % 2
-    return parity_state == parity_blank
-
-def solve(start_state, goal_state, max_iterations=1000, max_restarts=50):
+@budgeted
+def solve(start_state, goal_state, max_iterations=1000, max_restarts=50, *, meter):
     if not is_solvable(start_state, goal_state):
         return None
     
@@ -66,12 +31,14 @@ def solve(start_state, goal_state, max_iterations=1000, max_restarts=50):
         
         while current_state != goal_state and iterations < max_iterations:
             iterations += 1
-            neighbors = get_neighbors(current_state)
+            meter.tick(0, len(local_visited))
+            neighbors = get_scored_neighbors(current_state, current_score, goal_state)
+            meter.generated += len(neighbors)
+            meter.evaluations += len(neighbors)
             best_neighbor = None
             best_neighbor_score = float('inf')
             
-            for neighbor in neighbors:
-                score = manhattan_distance(neighbor, goal_state)
+            for neighbor, score in neighbors:
                 if score < best_neighbor_score and neighbor not in local_visited:
                     best_neighbor = neighbor
                     best_neighbor_score = score
@@ -80,10 +47,9 @@ def solve(start_state, goal_state, max_iterations=1000, max_restarts=50):
                 stuck_counter += 1
                 if stuck_counter >= 3:
                     break
-                unvisited_neighbors = [n for n in neighbors if n not in local_visited]
+                unvisited_neighbors = [(n, score) for n, score in neighbors if n not in local_visited]
                 if unvisited_neighbors:
-                    best_neighbor = random.choice(unvisited_neighbors)
-                    best_neighbor_score = manhattan_distance(best_neighbor, goal_state)
+                    best_neighbor, best_neighbor_score = random.choice(unvisited_neighbors)
                 else:
                     break
             else:
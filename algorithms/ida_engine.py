@@ -0,0 +1,165 @@
+"""Iterative IDA* engine shared by ida_star and ida_star_ANDOR.
+
+The search keeps one mutable board and an explicit stack of per-depth arrays
+(blank cell, heuristic value, next move to try), so there is no recursion and
+no per-node tuple allocation: a move is applied by swapping cells and undone by
+swapping them back. Instead of a visited set, the exact inverse of the move that
+led to a node is skipped, which removes the 2-cycles that dominate duplicates.
+"""
+from typing import List, Optional, Tuple
+
+from .budget import Meter
+from .core import State, move_tables
+from .heuristics import IncrementalHeuristic
+
+MAX_THRESHOLD = 100
+
+
+def _move_lists(length: int, double_moves: bool) -> List[Tuple[Tuple[int, int], ...]]:
+    """Per blank cell, the (middle, destination) moves to try; middle is -1 for a single slide."""
+    single, double = move_tables(length)
+    moves = []
+    for blank in range(length):
+        entries = [(-1, j) for j in single[blank]]
+        if double_moves:
+            entries.extend(double[blank])
+        moves.append(tuple(entries))
+    return moves
+
+
+def search(start_state: State, goal_state: State, h: IncrementalHeuristic, double_moves: bool = False,
+           max_threshold: int = MAX_THRESHOLD, order_children: bool = False,
+           meter: Optional[Meter] = None) -> Optional[List[State]]:
+    """Runs IDA* (every move, single or double, costs 1) and returns the path, or None.
+
+    With ``order_children`` each node tries its moves best-heuristic-first, which costs
+    one extra evaluation per child but finds shorter paths first when the heuristic
+    overestimates (as Manhattan distance does once double moves cost 1). ``meter`` is
+    ticked every time a node is entered, so budgets and cancellation stop the search;
+    each threshold iteration re-expands every node of the previous ones.
+    """
+    start_state = tuple(start_state); goal_state = tuple(goal_state)
+    meter = meter or Meter()
+    n = len(start_state)
+    if start_state == goal_state:
+        return [start_state]
+    h_start, extra_start = h.evaluate(start_state)
+    meter.evaluations += 1
+    if h_start == float('inf'):
+        return None
+
+    moves = _move_lists(n, double_moves)
+    board = list(start_state)
+    goal = list(goal_state)
+    max_depth = max_threshold + 1
+    blanks = [0] * (max_depth + 1)    # blank cell at each depth
+    middles = [-1] * (max_depth + 1)  # middle cell of the move that reached each depth
+    h_values = [0] * (max_depth + 1)
+    extras = [None] * (max_depth + 1)
+    next_move = [0] * (max_depth + 1)
+    orders = [None] * (max_depth + 1)
+
+    threshold = h_start
+    while threshold <= max_threshold:
+        meter.reexpanded = meter.expanded
+        meter.generated += len(moves[start_state.index(n)])
+        meter.evaluations += len(moves[start_state.index(n)])
+        blanks[0] = start_state.index(n); middles[0] = -1
+        h_values[0] = h_start; extras[0] = extra_start; next_move[0] = 0
+        depth = 0
+        min_over = float('inf')
+        orders[0] = _ordered(board, moves[blanks[0]], h, h_start, extra_start, n) if order_children else None
+        if order_children:
+            meter.evaluations += len(moves[blanks[0]])
+        while depth >= 0:
+            blank = blanks[depth]
+            options = orders[depth] or moves[blank]
+            if next_move[depth] == len(options):
+                if depth == 0:
+                    break
+                # Undo the move that led here: slide the tiles back toward the previous blank.
+                previous = blanks[depth - 1]; middle = middles[depth]
+                if middle < 0:
+                    board[blank] = board[previous]; board[previous] = n
+                else:
+                    board[blank] = board[middle]; board[middle] = board[previous]; board[previous] = n
+                depth -= 1
+                continue
+            middle, destination = options[next_move[depth]]
+            next_move[depth] += 1
+            # Skip the inverse of the move that reached this node.
+            if depth and destination == blanks[depth - 1] and middle == middles[depth]:
+                continue
+
+            h_value = h_values[depth]; extra = extras[depth]
+            if middle < 0:
+                board[blank] = board[destination]; board[destination] = n
+                h_value, extra = h.slide(board, h_value, extra, destination, blank)
+            else:
+                board[blank] = board[middle]; board[middle] = n
+                h_value, extra = h.slide(board, h_value, extra, middle, blank)
+                board[middle] = board[destination]; board[destination] = n
+                h_value, extra = h.slide(board, h_value, extra, destination, middle)
+
+            f_value = depth + 1 + h_value
+            if f_value > threshold:
+                if f_value < min_over:
+                    min_over = f_value
+                if middle < 0:
+                    board[destination] = board[blank]; board[blank] = n
+                else:
+                    board[destination] = board[middle]; board[middle] = board[blank]; board[blank] = n
+                continue
+
+            depth += 1
+            meter.tick(depth)
+            # Children of this node, minus the inverse move (one heuristic update each).
+            meter.generated += len(moves[destination]) - 1
+            meter.evaluations += len(moves[destination]) - 1
+            blanks[depth] = destination; middles[depth] = middle
+            h_values[depth] = h_value; extras[depth] = extra; next_move[depth] = 0
+            if h_value == 0 and board == goal:
+                return _replay(start_state, blanks, middles, depth)
+            if order_children:
+                orders[depth] = _ordered(board, moves[destination], h, h_value, extra, n)
+                meter.evaluations += len(moves[destination])
+        if min_over == float('inf'):
+            return None
+        threshold = min_over
+    return None
+
+
+def _ordered(board: List[int], options, h: IncrementalHeuristic, h_value: int, extra, n: int):
+    """Sorts a node's moves by the heuristic value of the child they lead to (stable for ties)."""
+    blank = board.index(n)
+    scored = []
+    for middle, destination in options:
+        if middle < 0:
+            board[blank] = board[destination]; board[destination] = n
+            child_h, _ = h.slide(board, h_value, extra, destination, blank)
+            board[destination] = board[blank]; board[blank] = n
+        else:
+            board[blank] = board[middle]; board[middle] = n
+            child_h, child_extra = h.slide(board, h_value, extra, middle, blank)
+            board[middle] = board[destination]; board[destination] = n
+            child_h, _ = h.slide(board, child_h, child_extra, destination, middle)
+            board[destination] = board[middle]; board[middle] = board[blank]; board[blank] = n
+        scored.append((child_h, middle, destination))
+    scored.sort(key=lambda item: item[0])
+    return [(middle, destination) for _, middle, destination in scored]
+
+
+def _replay(start_state: State, blanks: List[int], middles: List[int], depth: int) -> List[State]:
+    """Rebuilds the path by re-applying the moves recorded on the stack."""
+    n = len(start_state)
+    board = list(start_state)
+    path = [start_state]
+    for d in range(1, depth + 1):
+        previous = blanks[d - 1]; middle = middles[d]; destination = blanks[d]
+        if middle < 0:
+            board[previous] = board[destination]
+        else:
+            board[previous] = board[middle]; board[middle] = board[destination]
+        board[destination] = n
+        path.append(tuple(board))
+    return path
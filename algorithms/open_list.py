@@ -0,0 +1,137 @@
+"""Open lists for best-first search.
+
+Every priority in this package (f, g or h) is a small non-negative integer, so
+BucketQueue keeps one bucket per priority value (Dial's algorithm): push and pop
+are O(1) amortised and never compare states. Inside a bucket, entries can be
+grouped by a second integer key -- A* passes g and prefers the deepest node,
+which reaches the goal sooner among equal-f candidates. HeapQueue offers the
+same interface on top of heapq for comparison.
+
+Neither structure supports decrease-key. Solvers push a node again when they
+find it cheaper and skip outdated entries when they pop them (lazy deletion),
+exactly as they already do with their closed and cost tables.
+"""
+from heapq import heappush, heappop
+from itertools import count
+from typing import Any, List, Optional, Tuple
+
+TIE_BREAKS = ("high", "low", None)
+
+
+class BucketQueue:
+    """Monotone-ish bucket priority queue for small integer priorities.
+
+    ``tie_break`` picks the entry with the highest ("high") or lowest ("low") tie key
+    within the lowest priority; with None, entries of equal priority pop LIFO.
+    HeapQueue pops equal entries FIFO instead.
+    """
+
+    def __init__(self, tie_break: Optional[str] = "high"):
+        if tie_break not in TIE_BREAKS:
+            raise ValueError(f"tie_break must be one of {TIE_BREAKS}, got {tie_break!r}.")
+        self.tie_break = tie_break
+        # Per priority: a stack (tie_break None) or a list of stacks indexed by tie key,
+        # the number of entries, and the tie key to look at first.
+        self._buckets: List[Any] = []
+        self._counts: List[int] = []
+        self._best: List[int] = []
+        self._min = 0
+        self._size = 0
+        if tie_break is None:
+            # Plain LIFO buckets: bind the branch-free variants.
+            self.push = self._push_stack
+            self.pop = self._pop_stack
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _push_stack(self, priority: int, item, tie: int = 0) -> None:
+        buckets = self._buckets
+        if priority >= len(buckets):
+            buckets.extend([[] for _ in range(priority + 1 - len(buckets))])
+        buckets[priority].append((tie, item))
+        if priority < self._min or not self._size:
+            self._min = priority
+        self._size += 1
+
+    def _pop_stack(self) -> Tuple[int, int, Any]:
+        if not self._size:
+            raise IndexError("pop from an empty BucketQueue")
+        buckets = self._buckets
+        priority = self._min
+        while not buckets[priority]:
+            priority += 1
+        self._min = priority
+        self._size -= 1
+        tie, item = buckets[priority].pop()
+        return priority, tie, item
+
+    def push(self, priority: int, item, tie: int = 0) -> None:
+        buckets = self._buckets
+        if priority >= len(buckets):
+            grow = priority + 1 - len(buckets)
+            buckets.extend([[] for _ in range(grow)])
+            self._counts.extend([0] * grow)
+            self._best.extend([0] * grow)
+        bucket = buckets[priority]
+        if tie >= len(bucket):
+            bucket.extend([[] for _ in range(tie + 1 - len(bucket))])
+        bucket[tie].append(item)
+        best = self._best[priority]
+        if not self._counts[priority] or (tie > best if self.tie_break == "high" else tie < best):
+            self._best[priority] = tie
+        self._counts[priority] += 1
+        if priority < self._min or not self._size:
+            self._min = priority
+        self._size += 1
+
+    def pop(self) -> Tuple[int, int, Any]:
+        """Removes and returns (priority, tie, item) for the best entry."""
+        if not self._size:
+            raise IndexError("pop from an empty BucketQueue")
+        counts = self._counts
+        priority = self._min
+        while not counts[priority]:
+            priority += 1
+        self._min = priority
+        counts[priority] -= 1
+        self._size -= 1
+        bucket = self._buckets[priority]
+        tie = self._best[priority]
+        step = -1 if self.tie_break == "high" else 1
+        while not bucket[tie]:
+            tie += step
+        self._best[priority] = tie
+        return priority, tie, bucket[tie].pop()
+
+
+class HeapQueue:
+    """heapq-backed queue with the BucketQueue interface; ties never compare items."""
+
+    def __init__(self, tie_break: Optional[str] = "high"):
+        if tie_break not in TIE_BREAKS:
+            raise ValueError(f"tie_break must be one of {TIE_BREAKS}, got {tie_break!r}.")
+        self._sign = -1 if tie_break == "high" else (1 if tie_break == "low" else 0)
+        self._heap: List[Tuple[int, int, int, int, Any]] = []
+        self._counter = count()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, priority: int, item, tie: int = 0) -> None:
+        heappush(self._heap, (priority, self._sign * tie, next(self._counter), tie, item))
+
+    def pop(self) -> Tuple[int, int, Any]:
+        priority, _, _, tie, item = heappop(self._heap)
+        return priority, tie, item
+
+
+OPEN_LISTS = {"bucket": BucketQueue, "heap": HeapQueue}
+
+
+def make_open_list(kind: str = "bucket", tie_break: Optional[str] = "high"):
+    """Creates an open list by name ("bucket" or "heap")."""
+    try:
+        return OPEN_LISTS[kind](tie_break)
+    except KeyError:
+        raise ValueError(f"Unknown open list '{kind}'. Available: {', '.join(OPEN_LISTS)}.") from None
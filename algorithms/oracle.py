@@ -0,0 +1,83 @@
+"""Distance oracle: exact solution lengths for every solvable 3x3 state.
+
+A one-time retrograde BFS from the goal stores the distance of all 181,440
+reachable states (1 byte each, indexed by ranking.solvable_index) in a table
+file that is memory-mapped on first use. Solving is then a greedy descent that
+always steps to a neighbor one move closer, O(path length). Goals are relabeled
+onto their canonical goal first, so there is one table per blank cell rather
+than one per goal. A second set of tables counts double moves as one action.
+"""
+from collections import deque
+from typing import List, Optional
+
+from .budget import Meter, budgeted
+from .core import State, get_neighbors, get_neighbors_with_double_moves, is_solvable
+from .ranking import SOLVABLE_COUNT, solvable_index
+from .relabel import relabel
+from .tables import load_table
+
+STANDARD_GOAL: State = (1, 2, 3, 4, 5, 6, 7, 8, 9)
+UNREACHED = 0xFF
+
+
+def build_distance_table(goal_state: State = STANDARD_GOAL, double_moves: bool = False) -> bytearray:
+    """Runs a BFS backwards from the goal and returns the distance of every solvable state."""
+    neighbors_of = get_neighbors_with_double_moves if double_moves else get_neighbors
+    distances = bytearray([UNREACHED]) * SOLVABLE_COUNT
+    distances[solvable_index(goal_state)] = 0
+    frontier = deque([goal_state])
+    while frontier:
+        state = frontier.popleft()
+        next_distance = distances[solvable_index(state)] + 1
+        for neighbor in neighbors_of(state):
+            index = solvable_index(neighbor)
+            if distances[index] == UNREACHED:
+                distances[index] = next_distance
+                frontier.append(neighbor)
+    return distances
+
+
+def distance_table(goal_state: State = STANDARD_GOAL, double_moves: bool = False):
+    """Returns the memory-mapped distance table for a canonical goal, building it if needed."""
+    name = ("distances_double_" if double_moves else "distances_") + "".join(map(str, goal_state)) + ".bin"
+    return load_table(name, lambda: bytes(build_distance_table(goal_state, double_moves)), SOLVABLE_COUNT)
+
+
+def distance(state: State, goal_state: State = STANDARD_GOAL, double_moves: bool = False) -> int:
+    """Returns the optimal number of moves from ``state`` to ``goal_state`` (both solvable 3x3 states)."""
+    start, goal, _ = relabel(state, goal_state)
+    return distance_table(goal, double_moves)[solvable_index(start)]
+
+
+@budgeted
+def solve(start_state: State, goal_state: State, *, meter: Meter) -> Optional[List[State]]:
+    """Solves 8-Puzzle optimally by descending the precomputed distance table."""
+    start_state = tuple(start_state); goal_state = tuple(goal_state)
+    if len(start_state) != 9 or not is_solvable(start_state, goal_state):
+        return None
+
+    meter.phase("tables")
+    start, goal, relabeling = relabel(start_state, goal_state)
+    distances = distance_table(goal)
+    meter.phase("search")
+    path = [start]
+    current = start
+    remaining = distances[solvable_index(current)]
+    while remaining > 0:
+        meter.tick()
+        neighbors = get_neighbors(current)
+        meter.generated += len(neighbors)
+        for neighbor in neighbors:
+            if distances[solvable_index(neighbor)] == remaining - 1:
+                current = neighbor
+                break
+        path.append(current)
+        remaining -= 1
+    return relabeling.restore_path(path)
+
+
+if __name__ == '__main__':
+    import time
+    start_time = time.time()
+    table = distance_table()
+    print(f"Distance table ready in {time.time() - start_time:.2f}s, max depth {max(table[:])}.")
@@ -0,0 +1,151 @@
+"""Additive disjoint pattern databases.
+
+A pattern database stores, for every placement of a group of tiles, the fewest
+moves *of those tiles* needed to bring them home (other tiles are
+indistinguishable and their moves are free). Because each move shifts exactly one
+tile, the values of disjoint groups can be added and the sum is still admissible.
+
+Tables are built by a 0-1 BFS over (group positions, blank cell) from the
+canonical goal of relabel.py, saved through tables.py and memory-mapped on first
+use, so one file per (blank cell, group) serves every goal. Entries are indexed
+by ``sum(position[i] * length**i)`` -- sparse, but lookups need no ranking.
+"""
+from collections import deque
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .core import State, move_tables
+from .relabel import Relabeling, canonical_goal
+from .tables import load_table
+
+UNREACHED = 0xFF
+
+# Default partitions of the tiles (canonical labels), by board length. Group sizes are
+# kept small enough for the pure-Python BFS: 4 tiles on 4x4 (a few seconds per group)
+# and 3 tiles on 5x5 (4-tile groups there would take minutes each).
+DEFAULT_PARTITIONS: Dict[int, Tuple[Tuple[int, ...], ...]] = {
+    9: ((1, 2, 3, 4), (5, 6, 7, 8)),
+    16: ((1, 2, 5, 6), (3, 4, 7, 8), (9, 10, 13, 14), (11, 12, 15)),
+    25: tuple(tuple(range(first, first + 3)) for first in range(1, 25, 3)),
+}
+
+
+def build_pattern_table(goal_state: State, group: Sequence[int]) -> bytearray:
+    """Computes the pattern database of ``group`` for ``goal_state`` with a 0-1 BFS."""
+    n = len(goal_state)
+    single = move_tables(n)[0]
+    k = len(group)
+    weights = [n ** i for i in range(k)]
+    table = bytearray([UNREACHED]) * (n ** k)
+    seen = bytearray(n ** k * n)
+
+    positions = tuple(goal_state.index(tile) for tile in group)
+    blank = goal_state.index(n)
+    frontier = deque([(0, positions, blank)])
+    while frontier:
+        cost, positions, blank = frontier.popleft()
+        key = sum(p * w for p, w in zip(positions, weights))
+        if seen[key * n + blank]:
+            continue
+        seen[key * n + blank] = 1
+        if cost < table[key]:
+            table[key] = cost
+        for j in single[blank]:
+            if j in positions:
+                # The blank swaps with a group tile: that tile moves, cost 1.
+                moved = tuple(blank if p == j else p for p in positions)
+                moved_key = sum(p * w for p, w in zip(moved, weights))
+                if not seen[moved_key * n + j]:
+                    frontier.append((cost + 1, moved, j))
+            elif not seen[key * n + j]:
+                frontier.appendleft((cost, positions, j))
+    return table
+
+
+class PatternDatabase:
+    """A set of disjoint pattern tables for one canonical goal, summed into one heuristic."""
+
+    def __init__(self, goal_state: State, partition: Optional[Sequence[Sequence[int]]] = None):
+        self.goal = tuple(goal_state)
+        n = len(self.goal)
+        if partition is None:
+            partition = DEFAULT_PARTITIONS.get(n)
+            if partition is None:
+                raise ValueError(f"No default pattern partition for a board of {n} cells.")
+        self.partition = tuple(tuple(group) for group in partition)
+        self.length = n
+        self._tables = None
+
+    def tables(self) -> List:
+        """Loads (building on first use) one memory-mapped table per group."""
+        if self._tables is None:
+            goal_name = "".join(f"{tile:02d}" if self.length > 9 else str(tile) for tile in self.goal)
+            self._tables = []
+            for group in self.partition:
+                name = f"pdb_{goal_name}_{'-'.join(map(str, group))}.bin"
+                self._tables.append(load_table(name, lambda group=group: bytes(build_pattern_table(self.goal, group)),
+                                               self.length ** len(group)))
+        return self._tables
+
+    def lookup(self, where: Sequence[int], groups: Sequence[Sequence[int]]) -> int:
+        """Sums the group values given each tile's cell (``where[tile]``) and the group labels to read."""
+        n = self.length
+        total = 0
+        for table, group in zip(self.tables(), groups):
+            key = 0
+            weight = 1
+            for tile in group:
+                key += where[tile] * weight
+                weight *= n
+            total += table[key]
+        return total
+
+
+@lru_cache(maxsize=None)
+def _database(blank_index: int, length: int) -> PatternDatabase:
+    return PatternDatabase(canonical_goal(blank_index, length))
+
+
+@lru_cache(maxsize=64)
+def _goal_lookup(goal_state: State) -> Tuple[PatternDatabase, Tuple[Tuple[int, ...], ...]]:
+    """Returns the database for a goal and its groups renamed into the goal's own labels."""
+    relabeling = Relabeling(goal_state)
+    n = len(goal_state)
+    database = _database(goal_state.index(n), n)
+    return database, tuple(relabeling.restore(group) for group in database.partition)
+
+
+def pdb_distance(state: State, goal_state: State) -> int:
+    """Additive pattern-database heuristic (default partition for the board size)."""
+    database, groups = _goal_lookup(tuple(goal_state))
+    where = [0] * (len(state) + 1)
+    for i, tile in enumerate(state):
+        where[tile] = i
+    return database.lookup(where, groups)
+
+
+if __name__ == '__main__':
+    import random
+    import time
+    from .core import is_solvable
+    from .heuristics import compare_heuristics
+
+    goal = (1, 2, 3, 4, 5, 6, 7, 8, 9)
+    start_time = time.time()
+    pdb_distance(goal, goal)
+    print(f"Pattern databases ready in {time.time() - start_time:.2f}s.")
+
+    rng = random.Random(0)
+    instances = []
+    while len(instances) < 5:
+        tiles = list(goal)
+        rng.shuffle(tiles)
+        if is_solvable(tuple(tiles), goal):
+            instances.append((tuple(tiles), goal))
+    results = compare_heuristics(instances)
+    print(f"{'instance':<30}{'expanded':>12}{'':>12}{'evaluations':>12}")
+    print(f"{'':<30}{'manhattan':>12}{'pdb':>12}{'manhattan':>12}{'pdb':>12}")
+    for (start, _), manhattan, pdb in zip(instances, results["manhattan"], results["pdb"]):
+        print(f"{str(start):<30}{manhattan[0]:>12}{pdb[0]:>12}{manhattan[1]:>12}{pdb[1]:>12}")
+    print(f"{'total':<30}{sum(r[0] for r in results['manhattan']):>12}{sum(r[0] for r in results['pdb']):>12}"
+          f"{sum(r[1] for r in results['manhattan']):>12}{sum(r[1] for r in results['pdb']):>12}")
@@ -0,0 +1,153 @@
+"""Algorithm portfolio: races several solvers on the same puzzle in separate processes.
+
+Which solver answers first depends on the instance (greedy search is instant on
+shallow puzzles, IDA* wins on deep ones, A* sits in between), so every member
+runs at once and the others are killed as soon as the race is decided:
+
+* without a deadline, the first member to return a valid path wins;
+* with a deadline (seconds), results are collected until it expires and the one
+  with the fewest slides is returned. A result from an optimal member ends the
+  race early, since nothing can beat it.
+
+Paths are compared by single slides (a double move counts as two), so single- and
+double-move solvers can be mixed in one portfolio. The returned SearchStats carries
+the winner's counters and names the winner in ``solver``; its only phase is "race",
+the wall time of the whole race, which already contains the winner's own phases.
+"""
+import importlib
+import multiprocessing
+import queue
+import time
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+from .budget import Budget, Meter, budgeted
+from .core import State, is_solvable, move_string
+
+DEFAULT_MEMBERS = ("a_star", "ida_star", "greedy_ANDOR", "beam_search")
+# Members whose paths are shortest in single slides; their answer cannot be improved on.
+OPTIMAL_MEMBERS = frozenset({"a_star", "ida_star", "bfs", "bidirectional_bfs", "ucs", "oracle"})
+POLL_INTERVAL = 0.05
+
+
+class RaceResult(NamedTuple):
+    algorithm: str
+    path: List[State]
+    slides: int
+    time: float
+    stats: Dict         # the member's SearchStats.as_dict()
+
+
+def _run_member(module_name: str, start_state: State, goal_state: State, results,
+                budget: Optional[Budget] = None, cancel=None) -> None:
+    """Process target: solves with one member and reports (name, path or None, seconds, counters)."""
+    started = time.perf_counter()
+    try:
+        stats = importlib.import_module(f"algorithms.{module_name}").solve(start_state, goal_state,
+                                                                           budget=budget, cancel=cancel)
+        path, counters = stats.path, stats.as_dict()
+    except Exception:
+        path, counters = None, {}
+    results.put((module_name, list(path) if path else None, time.perf_counter() - started, counters))
+
+
+def _accept(module_name: str, path, seconds: float, stats: Dict, goal_state: State) -> Optional[RaceResult]:
+    """Turns a member's answer into a RaceResult if it is a valid path to the goal."""
+    if not path or tuple(path[-1]) != goal_state:
+        return None
+    path = [tuple(state) for state in path]
+    try:
+        slides = len(move_string(path))
+    except ValueError:
+        return None
+    return RaceResult(module_name, path, slides, seconds, stats)
+
+
+def _race_in_process(start_state: State, goal_state: State, members: Sequence[str],
+                     deadline: Optional[float], meter: Meter) -> Optional[RaceResult]:
+    """Fallback for daemonic processes (e.g. batch pool workers), which cannot start children:
+    runs the members one after another and stops at the first valid path or at the deadline."""
+    started = time.perf_counter()
+    results = queue.SimpleQueue()
+    for module_name in members:
+        meter.check()
+        remaining = meter.remaining_time()
+        if deadline is not None:
+            left = deadline - (time.perf_counter() - started)
+            if left <= 0:
+                break
+            remaining = left if remaining is None else min(remaining, left)
+        _run_member(module_name, start_state, goal_state, results, Budget(time=remaining), meter.cancel)
+        found = _accept(*results.get(), goal_state)
+        if found:
+            return found
+    return None
+
+
+def race(start_state: State, goal_state: State, members: Sequence[str] = DEFAULT_MEMBERS,
+         deadline: Optional[float] = None, meter: Optional[Meter] = None) -> Optional[RaceResult]:
+    """Runs ``members`` in parallel processes and returns the winning RaceResult, or None.
+
+    ``meter`` is checked on every poll, so a budget or cancellation stops the whole race;
+    each member also gets the same budget for its own search.
+    """
+    start_state = tuple(start_state); goal_state = tuple(goal_state)
+    meter = meter or Meter()
+    if not is_solvable(start_state, goal_state):
+        return None
+    if multiprocessing.current_process().daemon:
+        return _race_in_process(start_state, goal_state, members, deadline, meter)
+
+    results = multiprocessing.Queue()
+    processes = {name: multiprocessing.Process(target=_run_member, args=(name, start_state, goal_state, results, meter.budget),
+                                               daemon=True)
+                 for name in members}
+    started = time.perf_counter()
+    for process in processes.values():
+        process.start()
+    pending = set(processes)
+    best = None
+    try:
+        while pending:
+            meter.check()
+            timeout = POLL_INTERVAL if meter.remaining_time() is None else min(POLL_INTERVAL, meter.remaining_time())
+            if deadline is not None:
+                timeout = min(timeout, deadline - (time.perf_counter() - started))
+                if timeout <= 0:
+                    break
+            try:
+                module_name, path, seconds, stats = results.get(timeout=timeout)
+            except queue.Empty:
+                # A member that exits normally has always queued its answer first;
+                # only ones that crashed (non-zero exit code) are dropped here.
+                pending = {name for name in pending if processes[name].exitcode in (None, 0)}
+                continue
+            pending.discard(module_name)
+            found = _accept(module_name, path, seconds, stats, goal_state)
+            if found is None:
+                continue
+            if deadline is None or module_name in OPTIMAL_MEMBERS:
+                return found
+            if best is None or found.slides < best.slides:
+                best = found
+        return best
+    finally:
+        for process in processes.values():
+            if process.is_alive():
+                process.terminate()
+        for process in processes.values():
+            process.join()
+        results.close()
+
+
+@budgeted
+def solve(start_state: State, goal_state: State, members: Sequence[str] = DEFAULT_MEMBERS,
+          deadline: Optional[float] = None, *, meter: Meter) -> Optional[List[State]]:
+    """Solves the puzzle with whichever member of the portfolio wins the race."""
+    meter.phase("race")
+    result = race(start_state, goal_state, members, deadline, meter)
+    if result is None:
+        return None
+    meter.solver = result.algorithm
+    for counter in ("expanded", "generated", "peak_open", "peak_closed", "evaluations", "reexpanded"):
+        setattr(meter, counter, result.stats.get(counter, 0))
+    return result.path
@@ -1,109 +1,399 @@
+"""Q-Learning over a dense, array-backed Q-table.
+
+Every solvable 3x3 state reachable from a canonical goal (relabel.canonical_goal)
+has a dense index in [0, 9!/2) (ranking.solvable_index), and an action is the
+direction the blank moves (core.MOVE_LETTERS: up, down, left, right). The Q-table
+is therefore one flat float32 array of 9!/2 x 4 entries, q[index * 4 + direction],
+and a precomputed transition table of the same shape holds the index each move
+leads to (BLOCKED where the blank would leave the board). The transition table is
+the same for every goal and lives in a memory-mapped table file; the goal is
+relabeled onto its canonical goal, so training only ever touches integers.
+Blocked moves keep a Q-value of -inf, so a row's maximum is over legal moves only.
+
+``train`` runs episodes one at a time from a single start state. With NumPy,
+``train_batched`` steps many environments at once instead -- action selection,
+rewards and TD updates are vector operations over arrays of state indices -- and
+restarts every finished environment from a state drawn from the whole solvable
+space, so one run yields a policy for every start, not just the one it began from.
+
+With ``planning_steps`` > 0, ``train`` runs prioritized sweeping (a Dyna-Q variant)
+instead of one TD update per step: every observed transition is recorded with its
+predecessor links, real steps only queue their (state, move) by the size of the TD
+error, and up to ``planning_steps`` backups per real step pop the largest errors
+and requeue the predecessors of whatever changed. The goal reward then flows back
+along the visited states in few episodes instead of one step per visit. Moves are
+deterministic, so the model of an observed move is the transition table itself.
+After each episode ``train`` checks the greedy path from its start state and
+records, in ``training_stats``, when it first reached the goal and when it
+stopped changing, so both modes can be compared.
+"""
+import heapq
 import random
 import time
+from array import array
+from typing import List, Optional
+
+from .budget import Meter, budgeted
+from .core import MOVE_LETTERS, MOVES, State, is_solvable
+from .ranking import SOLVABLE_COUNT, solvable_index, solvable_state
+from .q_store import ModelStore
+from .relabel import Relabeling, relabel
+from .tables import load_table
+
+try:
+    import numpy as np
+except ImportError:  # the batched trainer is optional
+    np = None
 
 ALPHA = 0.1; GAMMA = 0.9; EPSILON = 0.1
 NUM_EPISODES = 1000; MAX_STEPS_PER_EPISODE = 200
+GOAL_REWARD = 100; STEP_REWARD = -1
+# Batched training: ENVIRONMENTS x BATCH_STEPS transitions (about 20M) cover the whole
+# space. Moves are deterministic, so BATCH_ALPHA steps straight to the TD target;
+# ALPHA would need roughly ten times as many transitions.
+ENVIRONMENTS = 4096; BATCH_STEPS = 5000; BATCH_ALPHA = 1.0
+# Prioritized sweeping: backups per real step (0 = plain Q-learning) and the smallest
+# TD error worth queueing.
+PLANNING_STEPS = 0; PRIORITY_THRESHOLD = 1e-3
+# The greedy path from the start counts as converged once it is unchanged for this many episodes.
+CONVERGENCE_EPISODES = 50
+
+ACTIONS = len(MOVE_LETTERS)
+BLOCKED = -1
+BLANK_STRIDE = SOLVABLE_COUNT // 9      # indices per blank cell
+TRANSITIONS_NAME = "q_transitions.bin"
+
+
+def _legal_actions():
+    """(direction, target cell) pairs of every move of the blank from each cell of a 3x3 board."""
+    actions = []
+    for blank in range(9):
+        row, col = divmod(blank, 3)
+        actions.append(tuple((direction, (row + dr) * 3 + col + dc) for direction, (dr, dc) in enumerate(MOVES)
+                             if 0 <= row + dr < 3 and 0 <= col + dc < 3))
+    return tuple(actions)
+
+
+LEGAL_ACTIONS = _legal_actions()
+VALID_ACTIONS = tuple(tuple(direction for direction, _ in moves) for moves in LEGAL_ACTIONS)
+
+
+def build_transition_table() -> array:
+    """Returns next[index * ACTIONS + direction] for every even-parity 3x3 state, BLOCKED off the board."""
+    transitions = array('i', [BLOCKED]) * (SOLVABLE_COUNT * ACTIONS)
+    for index in range(SOLVABLE_COUNT):
+        state = solvable_state(index)
+        blank = index // BLANK_STRIDE
+        base = index * ACTIONS
+        for direction, target in LEGAL_ACTIONS[blank]:
+            neighbor = list(state)
+            neighbor[blank], neighbor[target] = neighbor[target], 9
+            transitions[base + direction] = solvable_index(tuple(neighbor))
+    return transitions
+
+
+def transition_table():
+    """Returns the memory-mapped transition table as a sequence of ints, building it if needed."""
+    table = load_table(TRANSITIONS_NAME, lambda: build_transition_table().tobytes(),
+                       SOLVABLE_COUNT * ACTIONS * array('i').itemsize)
+    return memoryview(table).cast('i')
+
+
+_initial_q_table: Optional[array] = None
+
+
+def initial_q_table() -> array:
+    """A fresh Q-table: 0.0 for every legal move and -inf for blocked ones."""
+    global _initial_q_table
+    if _initial_q_table is None:
+        _initial_q_table = array('f', [0.0 if target != BLOCKED else -float('inf') for target in transition_table()])
+    return array('f', _initial_q_table)
 
-def get_valid_actions(state_tuple):
-    """Returns list of possible actions (neighboring state_tuples)."""
-    state = list(state_tuple)
-    try: blank_index = state.index(9)
-    except ValueError: return []
-    row, col = divmod(blank_index, 3); possible_new_states = []
-    moves = [(-1, 0), (1, 0), (0, -1), (0, 1)] # dr, dc
-    for dr, dc in moves:
-        new_row, new_col = row + dr, col + dc
-        if 0 <= new_row < 3 and 0 <= new_col < 3:
-            new_s = state[:]; new_index = new_row * 3 + new_col
-            new_s[blank_index], new_s[new_index] = new_s[new_index], new_s[blank_index]
-            possible_new_states.append(tuple(new_s))
-    return possible_new_states
-
-def get_reward(state_tuple, goal_state_tuple):
-    """Calculates reward for a state."""
-    if state_tuple == goal_state_tuple: return 100
-    else: return -1
 
 class QLearningAgent:
-    def __init__(self, goal_state, alpha=ALPHA, gamma=GAMMA, epsilon=EPSILON):
-        self.q_table = {} # state_tuple -> {action_state_tuple: q_value}
-        self.goal_state = goal_state; self.alpha = alpha; self.gamma = gamma; self.epsilon = epsilon
+    def __init__(self, goal_state, alpha=ALPHA, gamma=GAMMA, epsilon=EPSILON, num_episodes=NUM_EPISODES,
+                 max_steps_per_episode=MAX_STEPS_PER_EPISODE, environments=ENVIRONMENTS, batch_steps=BATCH_STEPS,
+                 batch_alpha=BATCH_ALPHA, planning_steps=PLANNING_STEPS, q_table=None):
+        self.goal_state = tuple(goal_state); self.alpha = alpha; self.gamma = gamma; self.epsilon = epsilon
+        self.num_episodes = num_episodes; self.max_steps_per_episode = max_steps_per_episode
+        self.environments = environments; self.batch_steps = batch_steps; self.batch_alpha = batch_alpha
+        self.planning_steps = planning_steps
+        self.relabeling = Relabeling(self.goal_state)
+        self.goal_index = solvable_index(self.relabeling.goal)
+        self.transitions = transition_table()
+        # q[index * ACTIONS + direction]; any float32 buffer, e.g. a model mapped by q_store
+        self.q_table = initial_q_table() if q_table is None else q_table
+        self.seen = bytearray(SOLVABLE_COUNT)
+        self.states_seen = 0
         self.training_episodes = 0; self.nodes_expanded_during_training = 0
-    def get_q_value(self, state_tuple, action_state_tuple):
-        return self.q_table.get(state_tuple, {}).get(action_state_tuple, 0.0)
-    def choose_action(self, state_tuple):
-        possible_actions = get_valid_actions(state_tuple)
-        if not possible_actions: return None
-        if random.random() < self.epsilon: return random.choice(possible_actions)
-        else:
-            q_values = {action: self.get_q_value(state_tuple, action) for action in possible_actions}
-            max_q = -float('inf'); best_actions = []
-            for action, q_val in q_values.items(): # Renamed q to q_val
-                if q_val > max_q: max_q = q_val; best_actions = [action]
-                elif q_val == max_q: best_actions.append(action)
-            return random.choice(best_actions) if best_actions else None
-    def learn(self, state_tuple, action_state_tuple, reward, next_state_tuple):
-        self.nodes_expanded_during_training +=1
-        old_q_value = self.get_q_value(state_tuple, action_state_tuple)
-        next_possible_actions = get_valid_actions(next_state_tuple)
-        max_future_q = 0.0
-        if next_possible_actions:
-            max_future_q = max([self.get_q_value(next_state_tuple, future_action) for future_action in next_possible_actions], default=0.0)
-        new_q_value = old_q_value + self.alpha * (reward + self.gamma * max_future_q - old_q_value)
-        if state_tuple not in self.q_table: self.q_table[state_tuple] = {}
-        self.q_table[state_tuple][action_state_tuple] = new_q_value
-    def train(self, start_state_initial, num_episodes=NUM_EPISODES, max_steps_per_episode=MAX_STEPS_PER_EPISODE):
+        self.predecessors = {}      # next index -> slots (index * ACTIONS + direction) seen leading to it
+        self.planning_backups = 0
+        self.training_stats = {}    # filled by train()
+
+    @property
+    def hyperparameters(self):
+        """Everything that shapes the trained table; q_store keys saved models by it."""
+        return {"alpha": self.alpha, "gamma": self.gamma, "epsilon": self.epsilon,
+                "num_episodes": self.num_episodes, "max_steps_per_episode": self.max_steps_per_episode,
+                "environments": self.environments, "batch_steps": self.batch_steps, "batch_alpha": self.batch_alpha,
+                "planning_steps": self.planning_steps}
+
+    def index_of(self, state_tuple) -> int:
+        """Dense index of a state in this agent's (canonical) frame."""
+        return solvable_index(self.relabeling.apply(state_tuple))
+
+    def state_of(self, index) -> State:
+        """Inverse of index_of."""
+        return self.relabeling.restore(solvable_state(index))
+
+    def get_q_value(self, index, direction):
+        return self.q_table[index * ACTIONS + direction]
+
+    def choose_action(self, index):
+        """Epsilon-greedy direction for a state index; ties between best moves are broken at random."""
+        actions = VALID_ACTIONS[index // BLANK_STRIDE]
+        if random.random() < self.epsilon: return random.choice(actions)
+        q = self.q_table; base = index * ACTIONS
+        best = max(q[base + direction] for direction in actions)
+        best_actions = [direction for direction in actions if q[base + direction] == best]
+        return best_actions[0] if len(best_actions) == 1 else random.choice(best_actions)
+
+    def learn(self, index, direction, reward, next_index):
+        self.nodes_expanded_during_training += 1
+        q = self.q_table; slot = index * ACTIONS + direction; row = next_index * ACTIONS
+        max_future_q = max(q[row], q[row + 1], q[row + 2], q[row + 3])
+        q[slot] += self.alpha * (reward + self.gamma * max_future_q - q[slot])
+
+    def _sweep(self, queue, backups):
+        """Runs up to ``backups`` prioritized backups from ``queue`` (a heap of (-priority, slot)).
+
+        The model is exact (moves are deterministic), so a backup sets the value to its
+        target instead of stepping ``alpha`` of the way.
+        """
+        q = self.q_table; transitions = self.transitions; predecessors = self.predecessors
+        gamma = self.gamma; goal_index = self.goal_index
+        done = 0
+        while queue and done < backups:
+            _, slot = heapq.heappop(queue)
+            next_index = transitions[slot]
+            row = next_index * ACTIONS
+            reward = GOAL_REWARD if next_index == goal_index else STEP_REWARD
+            q[slot] = reward + gamma * max(q[row], q[row + 1], q[row + 2], q[row + 3])
+            done += 1
+            index = slot // ACTIONS
+            base = index * ACTIONS
+            future = gamma * max(q[base], q[base + 1], q[base + 2], q[base + 3])
+            reward = GOAL_REWARD if index == goal_index else STEP_REWARD
+            for predecessor in predecessors.get(index, ()):
+                priority = abs(reward + future - q[predecessor])
+                if priority > PRIORITY_THRESHOLD:
+                    heapq.heappush(queue, (-priority, predecessor))
+        self.planning_backups += done
+
+    def _greedy_path(self, index, max_path_length=50):
+        """Indices along the greedy policy (first best move on ties), or None if it loops or runs out."""
+        q = self.q_table; transitions = self.transitions
+        path = [index]; visited = {index}
+        while index != self.goal_index:
+            if len(path) > max_path_length: return None
+            base = index * ACTIONS
+            direction = max(VALID_ACTIONS[index // BLANK_STRIDE], key=lambda a: q[base + a])
+            index = transitions[base + direction]
+            if index in visited: return None
+            path.append(index); visited.add(index)
+        return tuple(path)
+
+    def train(self, start_state_initial, num_episodes=None, max_steps_per_episode=None, meter=None):
+        """Trains from one start state, with plain one-step TD updates or prioritized sweeping.
+
+        Afterwards ``training_stats`` holds the episodes and steps of this run, the
+        planning backups, the episode and wall time at which the greedy path from
+        the start first reached the goal, and the episode from which that path
+        stayed unchanged for CONVERGENCE_EPISODES episodes (None where not reached).
+        """
+        meter = meter or Meter()
+        num_episodes = num_episodes or self.num_episodes
+        max_steps_per_episode = max_steps_per_episode or self.max_steps_per_episode
         print(f"Q-Learning: Training for {num_episodes} episodes...")
-        start_time = time.time() # Renamed start_train_time
+        start_time = time.time()
+        start_index = self.index_of(start_state_initial); goal_index = self.goal_index
+        q = self.q_table; transitions = self.transitions; seen = self.seen
+        alpha = self.alpha; gamma = self.gamma; epsilon = self.epsilon
+        rand = random.random; pick = random.choice
+        if not seen[start_index]:
+            seen[start_index] = 1; self.states_seen += 1
+        steps = 0
+        planning_steps = self.planning_steps; predecessors = self.predecessors; queue = []
+        backups_before = self.planning_backups
+        stats = self.training_stats = {"episodes": 0, "steps": 0, "planning_backups": 0,
+                                       "episodes_to_first_valid_policy": None, "time_to_first_valid_policy": None,
+                                       "episodes_to_convergence": None}
+        last_path = None; stable_since = 0
+        # choose_action and learn inlined: this loop is where all the training time goes.
         for episode in range(num_episodes):
-            current_state = start_state_initial
-            for _ in range(max_steps_per_episode): # Renamed step to _
-                action_taken = self.choose_action(current_state)
-                if action_taken is None: break
-                next_state = action_taken; reward = get_reward(next_state, self.goal_state)
-                self.learn(current_state, action_taken, reward, next_state)
-                current_state = next_state
-                if current_state == self.goal_state: break
-            self.training_episodes +=1
-            if episode > 0 and episode % (num_episodes // 10 if num_episodes >=10 else 1) == 0: # Progress print
-                 print(f"Ep {episode}, Q-table size: {len(self.q_table)}")
+            current = start_index
+            for _ in range(max_steps_per_episode):
+                meter.tick(0, self.states_seen)
+                actions = VALID_ACTIONS[current // BLANK_STRIDE]
+                base = current * ACTIONS
+                if rand() < epsilon:
+                    direction = pick(actions)
+                else:
+                    best = max([q[base + a] for a in actions])
+                    best_actions = [a for a in actions if q[base + a] == best]
+                    direction = best_actions[0] if len(best_actions) == 1 else pick(best_actions)
+                next_index = transitions[base + direction]
+                reward = GOAL_REWARD if next_index == goal_index else STEP_REWARD
+                row = next_index * ACTIONS
+                slot = base + direction
+                if planning_steps:
+                    predecessors.setdefault(next_index, set()).add(slot)
+                    priority = abs(reward + gamma * max(q[row], q[row + 1], q[row + 2], q[row + 3]) - q[slot])
+                    if priority > PRIORITY_THRESHOLD:
+                        heapq.heappush(queue, (-priority, slot))
+                    self._sweep(queue, planning_steps)
+                else:
+                    q[slot] += alpha * (reward + gamma * max(q[row], q[row + 1], q[row + 2], q[row + 3]) - q[slot])
+                if not seen[next_index]:
+                    seen[next_index] = 1; self.states_seen += 1
+                steps += 1
+                current = next_index
+                if current == goal_index: break
+            self.training_episodes += 1
+            if stats["episodes_to_convergence"] is None:
+                path = self._greedy_path(start_index)
+                if path is not None and stats["episodes_to_first_valid_policy"] is None:
+                    stats["episodes_to_first_valid_policy"] = episode + 1
+                    stats["time_to_first_valid_policy"] = time.time() - start_time
+                if path != last_path:
+                    last_path = path; stable_since = episode + 1
+                elif path is not None and episode + 1 - stable_since >= CONVERGENCE_EPISODES:
+                    stats["episodes_to_convergence"] = stable_since
+            if episode > 0 and episode % (num_episodes // 10 if num_episodes >= 10 else 1) == 0:
+                print(f"Ep {episode}, states visited: {self.states_seen}")
+        self.nodes_expanded_during_training += steps
+        stats.update(episodes=num_episodes, steps=steps, planning_backups=self.planning_backups - backups_before)
         print(f"Training finished in {time.time() - start_time:.2f}s. Nodes expanded: {self.nodes_expanded_during_training}")
-    def get_policy_path(self, start_state_tuple, max_path_length=50):
-        path = [start_state_tuple]; current_state = start_state_tuple; visited_in_path = {start_state_tuple}
+
+    def train_batched(self, environments=None, batch_steps=None, meter=None):
+        """Steps ``environments`` episodes in lockstep for ``batch_steps`` rounds (requires NumPy).
+
+        Every environment starts, and restarts after reaching the goal or
+        max_steps_per_episode, from a uniformly drawn solvable state. When several
+        environments update the same (state, move) in one round, one of the updates wins.
+        """
+        if np is None:
+            raise RuntimeError("train_batched requires NumPy")
+        meter = meter or Meter()
+        environments = environments or self.environments
+        batch_steps = batch_steps or self.batch_steps
+        print(f"Q-Learning: Training {environments} environments for {batch_steps} steps...")
+        start_time = time.time()
+        rng = np.random.default_rng(random.getrandbits(64))   # reproducible under random.seed
+        q = np.frombuffer(self.q_table, dtype=np.float32).reshape(-1, ACTIONS)
+        transitions = np.frombuffer(self.transitions, dtype=np.int32).reshape(-1, ACTIONS)
+        seen = np.frombuffer(self.seen, dtype=np.uint8)
+        goal_index = self.goal_index; alpha = np.float32(self.batch_alpha); gamma = np.float32(self.gamma)
+        states = rng.integers(0, SOLVABLE_COUNT, environments)
+        steps = np.zeros(environments, dtype=np.int32)
+        seen[states] = 1
+        episodes = 0
+        for batch in range(batch_steps):
+            meter.tick(environments, self.states_seen, environments)
+            values = q[states]
+            noise = rng.random(values.shape, dtype=np.float32)      # random tie-breaking
+            greedy = np.where(values == values.max(axis=1, keepdims=True), noise, -1).argmax(axis=1)
+            explore = np.where(values > -np.inf, noise, -1).argmax(axis=1)
+            actions = np.where(rng.random(environments) < self.epsilon, explore, greedy)
+            next_states = transitions[states, actions]
+            rewards = np.where(next_states == goal_index, np.float32(GOAL_REWARD), np.float32(STEP_REWARD))
+            targets = rewards + gamma * q[next_states].max(axis=1)
+            old = q[states, actions]
+            q[states, actions] = old + alpha * (targets - old)
+            seen[next_states] = 1
+            steps += 1
+            done = (next_states == goal_index) | (steps >= self.max_steps_per_episode)
+            finished = int(done.sum())
+            if finished:
+                next_states[done] = rng.integers(0, SOLVABLE_COUNT, finished)
+                steps[done] = 0
+                seen[next_states[done]] = 1
+                episodes += finished
+            states = next_states
+            if batch > 0 and batch % (batch_steps // 10 if batch_steps >= 10 else 1) == 0:
+                self.states_seen = int(np.count_nonzero(seen))
+                print(f"Step {batch}, states visited: {self.states_seen}")
+        self.states_seen = int(np.count_nonzero(seen))
+        # Counted only once the run completes: solve() retries a run cut short by a budget.
+        self.training_episodes += episodes
+        self.nodes_expanded_during_training += environments * batch_steps
+        print(f"Training finished in {time.time() - start_time:.2f}s. Nodes expanded: {self.nodes_expanded_during_training}")
+
+    def get_policy_path(self, start_state_tuple, max_path_length=50) -> Optional[List[State]]:
+        """Follows the greedy policy without revisiting states; None if it does not reach the goal."""
+        q = self.q_table; transitions = self.transitions
+        current = self.index_of(start_state_tuple)
+        indices = [current]; visited_in_path = {current}
         for _ in range(max_path_length):
-            if current_state == self.goal_state: break
-            possible_actions = get_valid_actions(current_state)
-            if not possible_actions: return None
-            q_values = {action: self.get_q_value(current_state, action) for action in possible_actions}
-            best_action = None; max_q_val = -float('inf'); candidate_actions = [] # Renamed max_q
-            for action, q_val_policy in q_values.items(): # Renamed q to q_val_policy
-                if action not in visited_in_path:
-                    if q_val_policy > max_q_val: max_q_val = q_val_policy; candidate_actions = [action]
-                    elif q_val_policy == max_q_val: candidate_actions.append(action)
-            if not candidate_actions:
-                non_cycle_actions = [act for act in possible_actions if act not in visited_in_path]
-                if non_cycle_actions: best_action = random.choice(non_cycle_actions)
-                else: return None
-            else: best_action = random.choice(candidate_actions)
-            if best_action is None: return None
-            current_state = best_action; path.append(current_state); visited_in_path.add(current_state)
-        return path if path[-1] == self.goal_state else None
-
-q_agent = None; is_trained = False
-
-def solve(start_state, goal_state):
-    """Solves 8-puzzle using Q-Learning."""
-    global q_agent, is_trained
-    if q_agent is None or q_agent.goal_state != goal_state:
-        q_agent = QLearningAgent(goal_state=goal_state); is_trained = False
-    if not is_trained:
-        q_agent.train(start_state_initial=start_state); is_trained = True
-    path = q_agent.get_policy_path(start_state)
-    nodes_exp = q_agent.nodes_expanded_during_training if q_agent else 0 # Ensure agent exists
-    return (path, nodes_exp) if path else (None, nodes_exp)
+            if current == self.goal_index: break
+            base = current * ACTIONS
+            candidates = [(q[base + direction], transitions[base + direction])
+                          for direction in VALID_ACTIONS[current // BLANK_STRIDE]
+                          if transitions[base + direction] not in visited_in_path]
+            if not candidates: return None
+            best = max(value for value, _ in candidates)
+            current = random.choice([target for value, target in candidates if value == best])
+            indices.append(current); visited_in_path.add(current)
+        if indices[-1] != self.goal_index: return None
+        return [self.state_of(index) for index in indices]
+
+model_store = ModelStore(QLearningAgent, SOLVABLE_COUNT * ACTIONS)
+
+def hyperparameters():
+    """The module's current hyperparameters, under the names of QLearningAgent.hyperparameters.
+
+    solve() looks models up with exactly these, so the name it loads is the name
+    model_store.save() writes.
+    """
+    return {"alpha": ALPHA, "gamma": GAMMA, "epsilon": EPSILON, "num_episodes": NUM_EPISODES,
+            "max_steps_per_episode": MAX_STEPS_PER_EPISODE, "environments": ENVIRONMENTS,
+            "batch_steps": BATCH_STEPS, "batch_alpha": BATCH_ALPHA, "planning_steps": PLANNING_STEPS}
+
+@budgeted
+def solve(start_state, goal_state, *, meter):
+    """Solves 8-puzzle using Q-Learning.
+
+    The model for the goal comes from model_store (memory, then disk). An untrained
+    model gets one batched run over the whole space when NumPy is available; after
+    that it is only trained further -- from this start state -- when its policy
+    does not reach the goal. Trained models are saved again.
+    """
+    start_state = tuple(start_state); goal_state = tuple(goal_state)
+    if len(start_state) != 9 or not is_solvable(start_state, goal_state):
+        return None
+    start, goal, relabeling = relabel(start_state, goal_state)
+    meter.phase("tables")
+    agent = model_store.agent(goal, **hyperparameters())
+    if np is not None and agent.nodes_expanded_during_training == 0:
+        meter.phase("train")
+        agent.train_batched(meter=meter)
+        model_store.save(agent)
+    meter.phase("policy")
+    path = agent.get_policy_path(start)
+    if path is None:
+        meter.phase("train")
+        agent.train(start_state_initial=start, meter=meter)
+        model_store.save(agent)
+        meter.phase("policy")
+        path = agent.get_policy_path(start)
+    return relabeling.restore_path(path)
 
 if __name__ == '__main__':
     test_start = (1, 8, 2, 9, 4, 3, 7, 6, 5); test_goal = (1, 2, 3, 4, 5, 6, 7, 8, 9)
-    solution, nodes = solve(test_start, test_goal)
-    if solution: print("Path:", solution, "Nodes (training):", nodes)
-    else: print("No solution. Nodes (training):", nodes)
\ No newline at end of file
+    result = solve(test_start, test_goal)
+    if result: print("Path:", result.path, "Nodes (training):", result.expanded)
+    else: print("No solution. Nodes (training):", result.expanded)
+    for planning_steps in (0, 5):      # plain Q-learning vs prioritized sweeping
+        agent = QLearningAgent(test_goal, planning_steps=planning_steps)
+        agent.train(test_start)
+        print(f"planning_steps={planning_steps}:", agent.training_stats)
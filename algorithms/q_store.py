@@ -0,0 +1,112 @@
+"""Persistent store of trained Q-learning models, keyed by goal and hyperparameters.
+
+A model is the agent's dense Q-table (q_learning.ACTIONS float32 values per state
+index) saved under tables.TABLE_DIR as a 16-byte header -- magic, training
+episodes, training steps -- followed by the raw values. Loading maps the file
+copy-on-write, so pages are read lazily and further training on a loaded table
+never reaches the file until the model is saved again (atomically, like every
+table). Goals are relabeled onto their canonical goal first, so every goal with
+the blank in the same cell shares one model. Up to ``maxsize`` agents stay in
+memory, least recently used first out.
+"""
+import mmap
+import os
+import struct
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+from .core import State
+from .relabel import canonical_goal
+from .tables import save_table, table_path
+
+MAGIC = b"QTB1"
+HEADER = struct.Struct("<4sIQ")     # magic, training episodes, training steps
+DEFAULT_AGENTS = 4
+
+
+def model_name(goal_state: State, **hyperparameters) -> str:
+    """File name of the model for a goal's canonical goal and the given hyperparameters."""
+    goal = canonical_goal(tuple(goal_state).index(len(goal_state)), len(goal_state))
+    params = "_".join(f"{name}{value:g}" if isinstance(value, float) else f"{name}{value}"
+                      for name, value in sorted(hyperparameters.items()))
+    return f"q_{''.join(map(str, goal))}_{params}.bin"
+
+
+def save_model(name: str, q_table, episodes: int, steps: int) -> str:
+    """Writes a Q-table (any float32 buffer) with its training counters."""
+    return save_table(name, HEADER.pack(MAGIC, episodes, steps) + q_table.tobytes())
+
+
+def load_model(name: str, values: int) -> Optional[Tuple[memoryview, int, int]]:
+    """Maps a saved model copy-on-write; returns (q_table, episodes, steps), or None if missing or stale."""
+    path = table_path(name)
+    if not os.path.exists(path) or os.path.getsize(path) != HEADER.size + 4 * values:
+        return None
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    magic, episodes, steps = HEADER.unpack_from(mapped)
+    if magic != MAGIC:
+        return None
+    return memoryview(mapped)[HEADER.size:].cast('f'), episodes, steps
+
+
+class ModelStore:
+    """Bounded LRU of trained agents in front of the model files.
+
+    ``create(goal_state, q_table=None, **hyperparameters)`` builds an agent, untrained
+    unless the store passes it the Q-table of a saved model.
+    """
+
+    def __init__(self, create: Callable, values: int, maxsize: int = DEFAULT_AGENTS):
+        self.create = create
+        self.values = values
+        self.maxsize = maxsize
+        self.loaded = 0
+        self.saved = 0
+        self._agents: "OrderedDict[str, object]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._agents)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._agents.clear()
+
+    def info(self) -> Dict[str, int]:
+        return {"size": len(self._agents), "maxsize": self.maxsize, "loaded": self.loaded, "saved": self.saved}
+
+    def agent(self, goal_state: State, **hyperparameters):
+        """Returns the agent for a goal's canonical goal, from memory, from disk, or freshly created.
+
+        The agent always works against the canonical goal; callers relabel their
+        instance with relabel.relabel first.
+        """
+        goal = canonical_goal(tuple(goal_state).index(len(goal_state)), len(goal_state))
+        name = model_name(goal, **hyperparameters)
+        with self._lock:
+            agent = self._agents.get(name)
+            if agent is not None:
+                self._agents.move_to_end(name)
+                return agent
+        saved = load_model(name, self.values)
+        if saved is None:
+            agent = self.create(goal, **hyperparameters)
+        else:
+            agent = self.create(goal, q_table=saved[0], **hyperparameters)
+            agent.training_episodes, agent.nodes_expanded_during_training = saved[1:]
+            self.loaded += 1
+        with self._lock:
+            agent = self._agents.setdefault(name, agent)
+            self._agents.move_to_end(name)
+            while len(self._agents) > self.maxsize:
+                self._agents.popitem(last=False)
+        return agent
+
+    def save(self, agent) -> str:
+        """Persists an agent's Q-table under its goal and ``agent.hyperparameters``."""
+        path = save_model(model_name(agent.goal_state, **agent.hyperparameters), agent.q_table,
+                          agent.training_episodes, agent.nodes_expanded_during_training)
+        self.saved += 1
+        return path
@@ -0,0 +1,164 @@
+"""Permutation ranking (Lehmer code) for dense state indexing.
+
+``rank_state`` maps a board of ``n`` cells to an integer in ``[0, n!)`` and
+``unrank_state`` inverts it, so closed sets, parent links and cost maps can be
+flat ``array``/``bytearray`` tables instead of dicts keyed by tuples. On the
+3x3 board that is 9! = 362,880 slots, of which 181,440 are reachable from any
+given goal. Boards too large for a dense table fall back to dicts keyed by the
+compact integer code from core.encode_state.
+"""
+from array import array
+from itertools import permutations
+from math import factorial
+from typing import Callable, Dict, List, Tuple
+
+from .core import State, encode_state, decode_state, inversion_parity
+
+STATE_COUNT = factorial(9)
+SOLVABLE_COUNT = STATE_COUNT // 2
+_HALF_TILE_PERMUTATIONS = factorial(8) // 2
+MAX_DENSE_LENGTH = 9  # 10! slots would already be 36 MB per int32 table
+
+# On the 3x3 board the rank splits into a part that depends only on the first five
+# cells (their Lehmer digits count smaller tiles to the right, and the tiles in the
+# last four cells are exactly the ones not used in the first five) and a part that
+# depends only on the relative order of the last four. Both parts are tabulated,
+# keyed by tuple slices and by the matching bit fields of core.encode_state codes.
+_HEAD_CELLS = 5
+_CODE_BITS = 4
+_HEAD_MASK = (1 << (_HEAD_CELLS * _CODE_BITS)) - 1
+
+
+def _pack(tiles: Tuple[int, ...]) -> int:
+    code = 0
+    for tile in reversed(tiles):
+        code = (code << _CODE_BITS) | tile
+    return code
+
+
+def _build_split_tables(count: int, head_cells: int) -> Tuple[Dict[Tuple[int, ...], int], Dict[Tuple[int, ...], int]]:
+    """Tabulates the head and tail parts of the rank of permutations of 1..count."""
+    weights = [factorial(count - 1 - i) for i in range(count)]
+    head_parts: Dict[Tuple[int, ...], int] = {}
+    tail_parts: Dict[Tuple[int, ...], int] = {}
+    for head in permutations(range(1, count + 1), head_cells):
+        part = 0
+        for i, tile in enumerate(head):
+            part += (tile - 1 - sum(1 for t in head[:i] if t < tile)) * weights[i]
+        head_parts[head] = part
+    for tail in permutations(range(1, count + 1), count - head_cells):
+        part = 0
+        for i, tile in enumerate(tail):
+            part += sum(1 for t in tail[i + 1:] if t < tile) * weights[head_cells + i]
+        tail_parts[tail] = part
+    return head_parts, tail_parts
+
+
+_HEAD, _TAIL = _build_split_tables(9, _HEAD_CELLS)
+_HEAD_CODE = {_pack(head): part for head, part in _HEAD.items()}
+_TAIL_CODE = {_pack(tail): part for tail, part in _TAIL.items()}
+_HEAD8, _TAIL8 = _build_split_tables(8, 4)  # tiles 1..8 without the blank, for solvable_index
+
+
+def rank_state(state: State) -> int:
+    """Returns the lexicographic rank of a permutation of 1..n in [0, n!)."""
+    if len(state) == 9:
+        return _HEAD[state[:5]] + _TAIL[state[5:]]
+    n = len(state)
+    rank = 0
+    used = 0
+    for i, tile in enumerate(state):
+        rank += (tile - 1 - bin(used & ((1 << tile) - 2)).count('1')) * factorial(n - 1 - i)
+        used |= 1 << tile
+    return rank
+
+
+def rank_code(code: int) -> int:
+    """Returns rank_state of a 3x3 state given as a core.encode_state code, without unpacking it."""
+    return _HEAD_CODE[code & _HEAD_MASK] + _TAIL_CODE[code >> (_HEAD_CELLS * _CODE_BITS)]
+
+
+def solvable_index(state: State) -> int:
+    """Returns a dense index in [0, SOLVABLE_COUNT) for a 3x3 state.
+
+    The index is blank_position * 8!/2 + rank(tiles without blank) // 2. Lexicographic
+    ranks 2k and 2k+1 differ by swapping the last two tiles, i.e. have opposite
+    parity, so the index is a bijection on any set of states that share a tile
+    parity -- exactly the states reachable from one goal. States of the other
+    parity collide with reachable ones and must be rejected by the caller.
+    """
+    blank = state.index(9)
+    tiles = state[:blank] + state[blank + 1:]
+    return blank * _HALF_TILE_PERMUTATIONS + (_HEAD8[tiles[:4]] + _TAIL8[tiles[4:]]) // 2
+
+
+def solvable_state(index: int, parity: int = 0) -> State:
+    """Inverse of solvable_index for states whose tiles have the given inversion parity."""
+    blank, half = divmod(index, _HALF_TILE_PERMUTATIONS)
+    tiles = unrank_state(2 * half, 8)
+    state = tiles[:blank] + (9,) + tiles[blank:]
+    if inversion_parity(state) != parity:
+        tiles = unrank_state(2 * half + 1, 8)
+        state = tiles[:blank] + (9,) + tiles[blank:]
+    return state
+
+
+def unrank_state(rank: int, length: int = 9) -> State:
+    """Inverse of rank_state: rebuilds the permutation of 1..length with the given rank."""
+    remaining: List[int] = list(range(1, length + 1))
+    tiles = []
+    for i in range(length - 1, -1, -1):
+        digit, rank = divmod(rank, factorial(i))
+        tiles.append(remaining.pop(digit))
+    return tuple(tiles)
+
+
+class SparseTable(dict):
+    """Dict that reads like a pre-filled array: missing keys return ``fill`` without being stored."""
+
+    def __init__(self, fill):
+        super().__init__()
+        self.fill = fill
+
+    def __missing__(self, key):
+        return self.fill
+
+
+class StateIndexer:
+    """Maps states of one board length to integer keys and allocates tables keyed by them.
+
+    Boards up to MAX_DENSE_LENGTH cells use permutation ranks and flat arrays; larger
+    boards use compact codes and SparseTable, behind the same ``table[key]`` interface.
+    """
+
+    def __init__(self, length: int):
+        self.length = length
+        self.dense = length <= MAX_DENSE_LENGTH
+        self.index: Callable[[State], int] = rank_state if self.dense else encode_state
+        # Key of a core.encode_state code: its rank on the 3x3 board, the code itself otherwise.
+        if length == 9:
+            self.code_index: Callable[[int], int] = rank_code
+        elif self.dense:
+            self.code_index = lambda code: rank_state(decode_state(code, length))
+        else:
+            self.code_index = lambda code: code
+        self.size = factorial(length) if self.dense else None
+
+    def state(self, key: int) -> State:
+        """Returns the state stored under ``key``."""
+        return unrank_state(key, self.length) if self.dense else decode_state(key, self.length)
+
+    def table(self, typecode: str, fill: int):
+        """Allocates a table over every state, initialised to ``fill``."""
+        if self.dense:
+            return array(typecode, [fill]) * self.size
+        return SparseTable(fill)
+
+    def path(self, key: int, parent) -> List[State]:
+        """Rebuilds the root-first path ending at ``key`` from a parent table (root points to itself)."""
+        keys = [key]
+        while parent[key] != key:
+            key = parent[key]
+            keys.append(key)
+        keys.reverse()
+        return [self.state(k) for k in keys]
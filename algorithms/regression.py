@@ -0,0 +1,211 @@
+"""Compares two benchmark result files and flags significant regressions.
+
+    python -m algorithms.benchmark compare baseline.json candidate.json
+    python -m algorithms.benchmark compare old.json new.json --time-threshold 20 --alpha 0.01
+
+Runs are paired by algorithm and instance id, then grouped into the depth buckets
+of the baseline. For each bucket and metric (wall time, expansions, peak memory)
+the per-instance log ratios candidate/baseline go through a one-sided Wilcoxon
+signed-rank test. The change is the geometric mean of the ratios.
+
+Both files must come from at least MIN_REPEAT interleaved timing passes. The
+spread between the repeats of an instance, ln(slowest / fastest), measures how
+noisy its timings are; a bucket's noise is the median of the larger of the two
+runs' spreads, and a time change smaller than that is not flagged whatever its
+p-value. The p-values of all bucket x metric rows are adjusted together with
+Holm's step-down method, so running many tests does not inflate the false alarm
+rate. A bucket is a regression when the change exceeds the metric's threshold
+and its noise and the adjusted p-value is below ``alpha``; improvements are
+reported the same way. Instances that the baseline solves but the candidate does
+not are always regressions. Everything is computed with the standard library, so
+the comparison runs offline.
+"""
+import json
+import math
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .benchmark import bucket_of
+
+METRICS = ("time", "expanded", "memory")
+# Relative change (percent) a metric must exceed before it can be flagged.
+THRESHOLDS = {"time": 10.0, "expanded": 5.0, "memory": 10.0}
+# Added to both sides of a ratio so zero-valued measurements compare as equal; the
+# time floor also damps solves of a few milliseconds, whose timings are mostly noise.
+FLOORS = {"time": 2e-3, "expanded": 1.0, "memory": 1e-3}
+ALPHA = 0.05
+MIN_REPEAT = 3      # timing passes each result file needs before it can be compared
+EXACT_LIMIT = 50    # pairs up to which the signed-rank distribution is enumerated exactly
+
+REGRESSION = "regression"
+IMPROVEMENT = "improvement"
+
+
+def load_results(path: str) -> Dict:
+    with open(path, encoding="utf-8") as results_file:
+        return json.load(results_file)
+
+
+def _ranks(values: Sequence[float]) -> List[float]:
+    """1-based ranks of ``values``, ties sharing their average rank."""
+    order = sorted(range(len(values)), key=lambda i: values[i])
+    ranks = [0.0] * len(values)
+    i = 0
+    while i < len(order):
+        j = i
+        while j + 1 < len(order) and values[order[j + 1]] == values[order[i]]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[order[k]] = (i + j) / 2 + 1
+        i = j + 1
+    return ranks
+
+
+def signed_rank_p(differences: Sequence[float]) -> float:
+    """One-sided Wilcoxon signed-rank p-value for the differences being shifted above zero.
+
+    Zero differences are dropped. Up to EXACT_LIMIT pairs the null distribution is
+    counted exactly (ranks are doubled so tied half-ranks stay integers); beyond that
+    the normal approximation with tie correction and continuity correction is used.
+    """
+    nonzero = [d for d in differences if d != 0]
+    n = len(nonzero)
+    if n == 0:
+        return 1.0
+    ranks = _ranks([abs(d) for d in nonzero])
+    w_plus = sum(rank for rank, d in zip(ranks, nonzero) if d > 0)
+    if n <= EXACT_LIMIT:
+        doubled = [int(round(rank * 2)) for rank in ranks]
+        counts = [1] + [0] * sum(doubled)
+        for rank in doubled:
+            for total in range(len(counts) - 1, rank - 1, -1):
+                counts[total] += counts[total - rank]
+        threshold = int(round(w_plus * 2))
+        return sum(counts[threshold:]) / 2 ** n
+    mean = n * (n + 1) / 4
+    ties = defaultdict(int)
+    for rank in ranks:
+        ties[rank] += 1
+    variance = n * (n + 1) * (2 * n + 1) / 24 - sum(t ** 3 - t for t in ties.values()) / 48
+    if variance <= 0:
+        return 1.0
+    z = (w_plus - mean - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def holm(p_values: Sequence[float]) -> List[float]:
+    """Holm-Bonferroni adjusted p-values, in the order given."""
+    m = len(p_values)
+    adjusted = [1.0] * m
+    running = 0.0
+    for rank, i in enumerate(sorted(range(m), key=lambda i: p_values[i])):
+        running = max(running, min(1.0, (m - rank) * p_values[i]))
+        adjusted[i] = running
+    return adjusted
+
+
+def spread(times: Sequence[float], floor: float = 0.0) -> float:
+    """Log ratio of the slowest to the fastest repeat: 0 for perfectly stable timings."""
+    if len(times) < 2:
+        return 0.0
+    return math.log((max(times) + floor) / (min(times) + floor))
+
+
+def check_repeats(results: Dict, min_repeat: int = MIN_REPEAT) -> None:
+    """Raises ValueError when a result file has too few timing repeats to estimate noise."""
+    repeat = results.get("meta", {}).get("repeat", 1)
+    if repeat < min_repeat:
+        raise ValueError(f"results were timed {repeat} time(s) per instance; rerun with --repeat {min_repeat} or more")
+
+
+def _pairs(baseline: Dict, candidate: Dict) -> Dict[Tuple[str, str], Tuple[Dict, Dict]]:
+    runs = {(run["algorithm"], run["id"]): run for run in baseline["runs"]}
+    return {key: (runs[key], run) for run in candidate["runs"]
+            for key in [(run["algorithm"], run["id"])] if key in runs}
+
+
+def compare_results(baseline: Dict, candidate: Dict, thresholds: Optional[Dict[str, float]] = None,
+                    alpha: float = ALPHA, width: Optional[int] = None, min_repeat: int = MIN_REPEAT) -> List[Dict]:
+    """Returns one row per algorithm, depth bucket and metric (plus "solved"), with a verdict.
+
+    Raises ValueError if either file has fewer than ``min_repeat`` timing repeats.
+    """
+    check_repeats(baseline, min_repeat)
+    check_repeats(candidate, min_repeat)
+    thresholds = {**THRESHOLDS, **(thresholds or {})}
+    width = width or baseline.get("meta", {}).get("bucket_width", 4)
+    groups: Dict[Tuple[str, str], List[Tuple[Dict, Dict]]] = defaultdict(list)
+    for (algorithm, _), (old, new) in _pairs(baseline, candidate).items():
+        groups[algorithm, bucket_of(old["depth"], width)].append((old, new))
+
+    rows = []
+    for (algorithm, bucket), pairs in sorted(groups.items(), key=lambda item: (item[0][0], int(item[0][1].split("-")[0]))):
+        lost = sum(1 for old, new in pairs if old["solved"] and not new["solved"])
+        gained = sum(1 for old, new in pairs if new["solved"] and not old["solved"])
+        rows.append({"algorithm": algorithm, "bucket": bucket, "metric": "solved", "pairs": len(pairs),
+                     "baseline": sum(old["solved"] for old, _ in pairs), "candidate": sum(new["solved"] for _, new in pairs),
+                     "change": None, "noise": None, "p": None, "p_adj": None,
+                     "verdict": REGRESSION if lost else IMPROVEMENT if gained else ""})
+        for metric in METRICS:
+            measured = [(old, new) for old, new in pairs if old.get(metric) is not None and new.get(metric) is not None]
+            if not measured:
+                continue
+            floor = FLOORS[metric]
+            logs = [math.log((new[metric] + floor) / (old[metric] + floor)) for old, new in measured]
+            mean_log = sum(logs) / len(logs)
+            noise = 0.0
+            if metric == "time":
+                noise = _median([max(spread(old.get("times", []), floor), spread(new.get("times", []), floor))
+                                 for old, new in measured])
+            # One-sided p-value in the direction the change points to.
+            p = signed_rank_p(logs) if mean_log >= 0 else signed_rank_p([-x for x in logs])
+            rows.append({"algorithm": algorithm, "bucket": bucket, "metric": metric, "pairs": len(measured),
+                         "baseline": _median([old[metric] for old, _ in measured]),
+                         "candidate": _median([new[metric] for _, new in measured]),
+                         "change": round((math.exp(mean_log) - 1) * 100, 2),
+                         "noise": round((math.exp(noise) - 1) * 100, 2), "p": p, "p_adj": None, "verdict": "",
+                         "_log": mean_log, "_noise": noise})
+
+    tested = [row for row in rows if row["p"] is not None]
+    for row, p_adj in zip(tested, holm([row["p"] for row in tested])):
+        row["p_adj"] = p_adj
+        mean_log, noise = row.pop("_log"), row.pop("_noise")
+        threshold = math.log1p(thresholds[row["metric"]] / 100)
+        if p_adj < alpha and abs(mean_log) > max(threshold, noise):
+            row["verdict"] = REGRESSION if mean_log > 0 else IMPROVEMENT
+    return rows
+
+
+def _median(values: List[float]) -> float:
+    values = sorted(values)
+    middle = len(values) // 2
+    return values[middle] if len(values) % 2 else (values[middle - 1] + values[middle]) / 2
+
+
+def mismatches(baseline: Dict, candidate: Dict) -> List[str]:
+    """Describes settings that differ between the two runs and make them less comparable."""
+    old, new = baseline.get("meta", {}), candidate.get("meta", {})
+    notes = [f"{key}: {old.get(key)!r} vs {new.get(key)!r}"
+             for key in ("corpus", "seed", "budget", "trace_memory", "python", "platform") if old.get(key) != new.get(key)]
+    unpaired = len(candidate["runs"]) - len(_pairs(baseline, candidate))
+    if unpaired:
+        notes.append(f"{unpaired} candidate runs have no baseline counterpart")
+    return notes
+
+
+def format_comparison(rows: List[Dict], show_all: bool = False) -> str:
+    """Renders comparison rows as a table; unless ``show_all``, only flagged rows are listed."""
+    header = (f"{'algorithm':<28}{'depth':>7}{'metric':>10}{'pairs':>7}{'baseline':>12}{'candidate':>12}"
+              f"{'change':>9}{'noise':>8}{'p':>8}{'p adj':>8}  verdict")
+    lines = [header, "-" * len(header)]
+    for row in rows:
+        if not show_all and not row["verdict"]:
+            continue
+        change = "-" if row["change"] is None else f"{row['change']:+.1f}%"
+        noise = "-" if not row["noise"] else f"{row['noise']:.0f}%"
+        p = "-" if row["p"] is None else f"{row['p']:.3f}"
+        p_adj = "-" if row["p_adj"] is None else f"{row['p_adj']:.3f}"
+        lines.append(f"{row['algorithm']:<28}{row['bucket']:>7}{row['metric']:>10}{row['pairs']:>7}"
+                     f"{row['baseline']:>12.4g}{row['candidate']:>12.4g}{change:>9}{noise:>8}{p:>8}{p_adj:>8}"
+                     f"  {row['verdict']}")
+    return "\n".join(lines)
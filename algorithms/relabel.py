@@ -0,0 +1,124 @@
+"""Goal relabeling: turns any (start, goal) pair into one against a canonical goal.
+
+Renaming tiles does not change which moves are legal (only the blank moves), so a
+puzzle can be solved against the canonical goal with the blank in the same cell,
+``1..n-1`` in reading order, and the resulting path renamed back. A table built for a
+canonical goal therefore serves every goal with its blank in that cell.
+
+Reflections and rotations of the board keep adjacency too, so ``canonicalize``
+goes one step further: it tries all eight symmetries of the square, relabels each
+transformed goal and keeps the smallest (goal, start) pair. Instances that are
+mirror images or relabelings of one another share one canonical form.
+"""
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+from .core import State
+
+
+@lru_cache(maxsize=None)
+def canonical_goal(blank_index: int, length: int = 9) -> State:
+    """Returns the goal with tiles 1..length-1 in reading order and the blank at ``blank_index``."""
+    tiles = list(range(1, length))
+    tiles.insert(blank_index, length)
+    return tuple(tiles)
+
+
+class Relabeling:
+    """A renaming of tile labels that maps one goal onto its canonical goal (the blank keeps its label)."""
+
+    def __init__(self, goal_state: State):
+        goal_state = tuple(goal_state)
+        n = len(goal_state)
+        self.goal = canonical_goal(goal_state.index(n), n)
+        forward = [0] * (n + 1)
+        backward = [0] * (n + 1)
+        for label, canonical_label in zip(goal_state, self.goal):
+            forward[label] = canonical_label
+            backward[canonical_label] = label
+        self._forward = tuple(forward)
+        self._backward = tuple(backward)
+        self.identity = goal_state == self.goal
+
+    def apply(self, state: State) -> State:
+        """Renames the tiles of a state into canonical labels."""
+        if self.identity:
+            return tuple(state)
+        forward = self._forward
+        return tuple([forward[tile] for tile in state])
+
+    def restore(self, state: State) -> State:
+        """Renames the tiles of a canonical state back to the original labels."""
+        if self.identity:
+            return tuple(state)
+        backward = self._backward
+        return tuple([backward[tile] for tile in state])
+
+    def restore_path(self, path: List[State]) -> List[State]:
+        """Renames every state of a path found against the canonical goal."""
+        if path is None:
+            return None
+        return [self.restore(state) for state in path]
+
+
+def relabel(start_state: State, goal_state: State) -> Tuple[State, State, Relabeling]:
+    """Maps (start, goal) to (start', canonical goal) and returns the relabeling for the way back."""
+    relabeling = Relabeling(goal_state)
+    return relabeling.apply(start_state), relabeling.goal, relabeling
+
+
+@lru_cache(maxsize=None)
+def symmetries(length: int = 9) -> Tuple[Tuple[int, ...], ...]:
+    """The eight reflections/rotations of a square board as cell maps (new[i] = old[cells[i]]).
+
+    Boards that are not square only get the identity.
+    """
+    side = int(round(length ** 0.5))
+    if side * side != length:
+        return (tuple(range(length)),)
+    maps = []
+    for transform in (lambda r, c: (r, c), lambda r, c: (c, side - 1 - r),
+                      lambda r, c: (side - 1 - r, side - 1 - c), lambda r, c: (side - 1 - c, r),
+                      lambda r, c: (r, side - 1 - c), lambda r, c: (side - 1 - r, c),
+                      lambda r, c: (c, r), lambda r, c: (side - 1 - c, side - 1 - r)):
+        maps.append(tuple(row * side + col for row, col in (transform(*divmod(i, side)) for i in range(length))))
+    return tuple(maps)
+
+
+class Canonicalization:
+    """A board symmetry followed by the relabeling of the transformed goal."""
+
+    def __init__(self, cells: Tuple[int, ...], relabeling: Relabeling):
+        self.cells = cells
+        self.relabeling = relabeling
+        inverse = [0] * len(cells)
+        for i, cell in enumerate(cells):
+            inverse[cell] = i
+        self._inverse = tuple(inverse)
+
+    def apply(self, state: State) -> State:
+        """Maps a state of the original instance into the canonical frame."""
+        return self.relabeling.apply(tuple([state[cell] for cell in self.cells]))
+
+    def restore(self, state: State) -> State:
+        """Maps a canonical state back to the original instance."""
+        state = self.relabeling.restore(state)
+        return tuple([state[cell] for cell in self._inverse])
+
+    def restore_path(self, path: Optional[List[State]]) -> Optional[List[State]]:
+        if path is None:
+            return None
+        return [self.restore(state) for state in path]
+
+
+def canonicalize(start_state: State, goal_state: State,
+                 use_symmetries: bool = True) -> Tuple[State, State, Canonicalization]:
+    """Maps (start, goal) to the smallest (start', goal') over the board symmetries and relabelings."""
+    start_state = tuple(start_state); goal_state = tuple(goal_state)
+    best = None
+    for cells in symmetries(len(start_state)) if use_symmetries else (tuple(range(len(start_state))),):
+        start, goal, relabeling = relabel(tuple([start_state[cell] for cell in cells]),
+                                          tuple([goal_state[cell] for cell in cells]))
+        if best is None or (goal, start) < (best[1], best[0]):
+            best = (start, goal, Canonicalization(cells, relabeling))
+    return best
@@ -0,0 +1,79 @@
+"""SearchStats: the result object every solve() returns.
+
+Counters are collected by the solver's budget.Meter while it searches:
+
+* ``expanded`` -- nodes whose successors were generated (for local search and
+  Q-learning: steps taken);
+* ``generated`` -- successor states produced;
+* ``peak_open`` / ``peak_closed`` -- largest frontier and closed/visited set seen;
+* ``evaluations`` -- heuristic evaluations, incremental updates included;
+* ``reexpanded`` -- expansions of states already expanded before (iterative
+  deepening restarts, reopened DFS states);
+* ``phases`` -- seconds spent per phase ("setup", "search", "path", ...);
+* ``cached`` -- True when the result came from cache.SolutionCache, whose counters
+  are those of the search that first produced it;
+* ``solver`` -- the algorithm that produced the path when it is not the one called
+  (the winning member of a portfolio race), else None.
+
+A result is truthy when it carries a path, so ``if result:`` keeps working where
+code used to test the returned path.
+"""
+from typing import Dict, List, Optional
+
+from .core import State
+
+SOLVED = "solved"
+PARTIAL = "partial"              # a path that stops short of the goal (local search)
+NOT_FOUND = "not_found"
+BUDGET_EXCEEDED = "budget_exceeded"
+
+
+class SearchStats:
+    __slots__ = ("path", "status", "reason", "expanded", "generated", "peak_open", "peak_closed",
+                 "evaluations", "reexpanded", "phases", "elapsed", "memory", "cached", "solver")
+
+    def __init__(self, path: Optional[List[State]] = None, status: str = NOT_FOUND, reason: Optional[str] = None,
+                 expanded: int = 0, generated: int = 0, peak_open: int = 0, peak_closed: int = 0,
+                 evaluations: int = 0, reexpanded: int = 0, phases: Optional[Dict[str, float]] = None,
+                 elapsed: float = 0.0, memory: Optional[float] = None, cached: bool = False,
+                 solver: Optional[str] = None):
+        self.path = path
+        self.status = status
+        self.reason = reason          # why a budget stopped the search: "time", "expansions", "memory", "cancelled"
+        self.expanded = expanded
+        self.generated = generated
+        self.peak_open = peak_open
+        self.peak_closed = peak_closed
+        self.evaluations = evaluations
+        self.reexpanded = reexpanded
+        self.phases = phases or {}
+        self.elapsed = elapsed
+        self.memory = memory          # resident MB at the last budget check, if measured
+        self.cached = cached
+        self.solver = solver
+
+    @property
+    def solved(self) -> bool:
+        return self.status == SOLVED
+
+    @property
+    def steps(self) -> Optional[int]:
+        return len(self.path) - 1 if self.path else None
+
+    def __bool__(self) -> bool:
+        return bool(self.path)
+
+    def as_dict(self) -> dict:
+        """JSON-ready counters (the path itself is left to the caller)."""
+        return {"status": self.status, "reason": self.reason, "steps": self.steps,
+                "expanded": self.expanded, "generated": self.generated,
+                "peak_open": self.peak_open, "peak_closed": self.peak_closed,
+                "evaluations": self.evaluations, "reexpanded": self.reexpanded,
+                "phases": {name: round(seconds, 6) for name, seconds in self.phases.items()},
+                "elapsed": round(self.elapsed, 6), "memory": self.memory, "cached": self.cached,
+                "solver": self.solver}
+
+    def __repr__(self) -> str:
+        return (f"SearchStats({self.status}, steps={self.steps}, expanded={self.expanded}, "
+                f"generated={self.generated}, elapsed={self.elapsed:.3f}s{', cached' if self.cached else ''}"
+                f"{f', by {self.solver}' if self.solver else ''})")
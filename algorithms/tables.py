@@ -0,0 +1,46 @@
+"""On-disk storage for precomputed tables (distance oracles, pattern databases, ...).
+
+Tables are plain binary files under TABLE_DIR, built on first use and then
+memory-mapped read-only, so every process that opens the same table shares one
+copy in the OS page cache instead of rebuilding or unpickling it.
+"""
+import mmap
+import os
+from typing import Callable, Dict
+
+TABLE_DIR = os.environ.get("PUZZLE_TABLE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "tables"))
+
+_mapped: Dict[str, mmap.mmap] = {}
+
+
+def table_path(name: str) -> str:
+    """Returns the file path of a named table."""
+    return os.path.join(TABLE_DIR, name)
+
+
+def save_table(name: str, data: bytes) -> str:
+    """Writes a table atomically (temp file + rename) so readers never see a partial file."""
+    os.makedirs(TABLE_DIR, exist_ok=True)
+    path = table_path(name)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_table(name: str, build: Callable[[], bytes], size: int) -> mmap.mmap:
+    """Memory-maps a table, building and saving it first if it is missing or has the wrong size."""
+    table = _mapped.get(name)
+    if table is not None:
+        return table
+    path = table_path(name)
+    if not os.path.exists(path) or os.path.getsize(path) != size:
+        data = build()
+        if len(data) != size:
+            raise ValueError(f"Table {name} has {len(data)} bytes, expected {size}.")
+        save_table(name, data)
+    with open(path, "rb") as f:
+        table = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    _mapped[name] = table
+    return table
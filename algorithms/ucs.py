@@ -1,46 +1,42 @@
-from heapq import heappush, heappop
+from .budget import budgeted
+from .core import encode_state, get_code_neighbors
+from .open_list import make_open_list
+from .ranking import StateIndexer
 
-def get_neighbors(state):
-    neighbors = []
-    s = list(state)
-    blank_index = s.index(9)
-    row, col = divmod(blank_index, 3)
-    moves = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-    for dr, dc in moves:
-        new_row = row + dr
-        new_col = col + dc
-        if 0 <= new_row < 3 and 0 <= new_col < 3:
-            new_index = new_row * 3 + new_col
-            new_s = s[:]
-            new_s[blank_index], new_s[new_index] = new_s[new_index], new_s[blank_index]
-            neighbors.append(tuple(new_s))
-    return neighbors
-
-def reconstruct_path(state, parent):
-    path = []
-    while state is not None:
-        path.append(state)
-        state = parent[state]
-    path.reverse()
-    return path
-
-def solve(start_state, goal_state):
-    pq = [(0, start_state)]
-    costs = {start_state: 0}
-    parent = {start_state: None}
-    visited = set()
+@budgeted
+def solve(start_state, goal_state, open_list="bucket", *, meter):
+    meter.phase("setup")
+    n = len(start_state)
+    indexer = StateIndexer(n)
+    index = indexer.code_index
+    start_code = encode_state(start_state)
+    start = index(start_code)
+    goal = index(encode_state(goal_state))
+    costs = indexer.table('H', 0xFFFF)
+    parent = indexer.table('i', -1)
+    visited = indexer.table('B', 0)
+    costs[start] = 0
+    parent[start] = start
+    pq = make_open_list(open_list, tie_break=None)
+    pq.push(0, (start, start_code, start_state.index(n)))
+    meter.phase("search")
     
     while pq:
-        current_cost, current = heappop(pq)
-        if current == goal_state:
-            return reconstruct_path(current, parent)
-        if current in visited:
+        current_cost, _, (current, code, blank_index) = pq.pop()
+        if current == goal:
+            meter.phase("path")
+            return indexer.path(current, parent)
+        if visited[current]:
             continue
-        visited.add(current)
-        for next_state in get_neighbors(current):
+        visited[current] = 1
+        meter.tick(len(pq), meter.expanded + 1)
+        children = get_code_neighbors(code, blank_index, n)
+        meter.generated += len(children)
+        for next_code, next_blank in children:
+            next_rank = index(next_code)
             new_cost = current_cost + 1
-            if next_state not in costs or new_cost < costs[next_state]:
-                costs[next_state] = new_cost
-                parent[next_state] = current
-                heappush(pq, (new_cost, next_state))
-    return None
\ No newline at end of file
+            if new_cost < costs[next_rank]:
+                costs[next_rank] = new_cost
+                parent[next_rank] = current
+                pq.push(new_cost, (next_rank, next_code, next_blank))
+    return None
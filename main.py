@@ -1,17 +1,23 @@
 import pygame
 import sys
 import importlib
+import functools
 import os
 from collections import deque
 import time
 import traceback
 import subprocess
+import threading
 
 
 # --- Algorithm Import ---
 try:
     from algorithms import ALGORITHM_LIST
+    from algorithms.cache import SolutionCache
+    # Lời giải được nhớ lại theo dạng chuẩn (đối xứng + đổi nhãn), nên giải lại cùng một bàn cờ là tức thì.
+    solution_cache = SolutionCache()
 except ImportError:
+    solution_cache = None
     ALGORITHM_LIST = [
         ("Greedy Search", "greedy"), ("Greedy Search (Double Moves)", "greedy_double"),
         ("A* Search (Manhattan)", "a_star_manhattan"), ("A* Search (Manhattan, Double)", "a_star_manhattan_double"),
@@ -73,18 +79,6 @@ def is_solvable(state):
     return get_inversions(state) % 2 == 0
 def is_valid_puzzle_state(state):
     return isinstance(state, (list, tuple)) and len(state) == 9 and sorted(state) == list(range(1, 10))
-def get_neighbors(state):
-    neighbors = []; s = list(state)
-    try: blank_index = s.index(9)
-    except ValueError: return []
-    row, col = divmod(blank_index, 3); moves = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-    for dr, dc in moves:
-        new_row, new_col = row + dr, col + dc
-        if 0 <= new_row < 3 and 0 <= new_col < 3:
-            new_index = new_row * 3 + new_col; new_s = s[:]
-            new_s[blank_index], new_s[new_index] = new_s[new_index], new_s[blank_index]
-            neighbors.append(tuple(new_s))
-    return neighbors
 
 def adjust_path_scroll_to_current_centered(current_idx, num_total_items, item_height, visible_area_height, current_scroll_offset_pixels):
     if num_total_items == 0 or item_height == 0 or visible_area_height == 0:
@@ -219,6 +213,26 @@ class SpeedSlider:
         screen.blit(fast_label, fast_label.get_rect(midright=(self.track_rect.left - 10, self.track_rect.centery)))
     def get_speed(self): return int(self.current_speed)
 
+class SolverJob:
+    """Runs one solve() in a worker thread so the event loop keeps drawing at full rate.
+
+    The solver's meter calls _on_progress every few thousand expansions; the UI reads
+    the latest snapshot from ``progress`` and stops the search through ``cancel``.
+    """
+    def __init__(self, solve, algorithm_name, start_state, goal_state):
+        self.algorithm_name = algorithm_name; self.start_state = start_state
+        self.cancel_event = threading.Event(); self.progress = (0, 0, 0, 0, 0)  # expanded, generated, frontier, peak frontier, closed
+        self.result = None; self.error = None; self.done = False; self.started = time.time()
+        self.thread = threading.Thread(target=self._run, args=(solve, start_state, goal_state), daemon=True); self.thread.start()
+    def _run(self, solve, start_state, goal_state):
+        try: self.result = solve(start_state, goal_state, cancel=self.cancel_event, progress=self._on_progress)
+        except Exception as e: self.error = e; traceback.print_exc()
+        self.done = True
+    def _on_progress(self, meter): self.progress = (meter.expanded, meter.generated, meter.frontier, meter.peak_open, meter.closed)
+    def cancel(self): self.cancel_event.set()
+    def is_cancelling(self): return self.cancel_event.is_set()
+    def elapsed(self): return time.time() - self.started
+
 # --- GUI Drawing Functions ---
 def draw_menu(screen, title_font_param, font_param, button_font_param,
               solve_btn, edit_btn, blind_search_btn, fill_anim_btn,
@@ -323,7 +337,9 @@ def update_tiles(tiles_list, new_state, goal_state, puzzle_start_x, puzzle_start
             target_y = puzzle_start_y + row * tile_size_val
             tile_obj.set_target(target_x, target_y); tile_obj.is_solved_position = (tile_obj.value != 9 and tile_obj.value == goal_state[new_index])
 
-def draw_info_box(screen, font_param, info_font_param, steps_found, path_length, current_step, total_steps, algorithm_name, elapsed_time=None, box_rect_param=None):
+def draw_info_box(screen, font_param, info_font_param, stats, current_step, algorithm_name, box_rect_param=None):
+    """Draws the solver's SearchStats (algorithms/stats.py) and the playback progress."""
+    path_length = stats.steps if stats is not None else None; total_steps = path_length
     if box_rect_param: info_box_rect = box_rect_param
     else:
         box_width = min(WIDTH * 0.35, 400); box_height = 350
@@ -333,10 +349,15 @@ def draw_info_box(screen, font_param, info_font_param, steps_found, path_length,
     title_surface = font_param.render("Thông tin giải", True, SECONDARY)
     title_rect = title_surface.get_rect(centerx=info_box_rect.centerx, y=info_box_rect.y + 20)
     screen.blit(title_surface, title_rect)
-    info_lines = [f"Thuật toán: {algorithm_name}", f"Node đã duyệt: {steps_found if steps_found is not None else 'N/A'}",
-                  f"Độ dài đường đi: {path_length if path_length is not None else 'N/A'}",
-                  f"Bước hiện tại: {current_step}/{total_steps if total_steps is not None else 'N/A'}"]
-    if elapsed_time is not None: info_lines.append(f"Thời gian tìm kiếm: {elapsed_time:.3f} s")
+    info_lines = [f"Thuật toán: {algorithm_name}" + (f" ({stats.solver})" if stats is not None and stats.solver else "")]
+    if stats is not None:
+        info_lines += [f"Node duyệt / sinh: {stats.expanded} / {stats.generated}",
+                       f"Open / Closed tối đa: {stats.peak_open} / {stats.peak_closed}",
+                       f"Lượt tính heuristic: {stats.evaluations}"]
+        if stats.reexpanded: info_lines.append(f"Node duyệt lại: {stats.reexpanded}")
+    info_lines += [f"Độ dài đường đi: {path_length if path_length is not None else 'N/A'}",
+                   f"Bước hiện tại: {current_step}/{total_steps if total_steps is not None else 'N/A'}"]
+    if stats is not None: info_lines.append(f"Thời gian tìm kiếm: {stats.elapsed:.3f} s" + (" (bộ nhớ đệm)" if stats.cached else ""))
     line_y = info_box_rect.y + 60
     for text in info_lines: line_surf = info_font_param.render(text, True, LIGHT_GRAY); screen.blit(line_surf, (info_box_rect.x + 20, line_y)); line_y += 30
     if total_steps is not None and total_steps > 0:
@@ -490,9 +511,29 @@ def draw_blind_preview(screen, title_font_param, font_param, info_font_param, bu
     back_btn.rect.centerx = WIDTH // 2 + back_btn.rect.width // 2 + 10; back_btn.rect.y = button_y
     start_btn.check_hover(pygame.mouse.get_pos()); back_btn.check_hover(pygame.mouse.get_pos()); start_btn.draw(screen, button_font_param); back_btn.draw(screen, button_font_param)
 
+def draw_solving_overlay(screen, font_param, info_font_param, button_font_param, job, cancel_btn):
+    overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA); overlay.fill((0, 0, 0, 160)); screen.blit(overlay, (0, 0))
+    box_rect = pygame.Rect((WIDTH - 480) // 2, (HEIGHT - 330) // 2, 480, 330)
+    pygame.draw.rect(screen, GRAY, box_rect, border_radius=10); pygame.draw.rect(screen, DARK_BG, box_rect.inflate(-4, -4), border_radius=10)
+    title_surface = font_param.render(f"Đang giải: {job.algorithm_name}", True, SECONDARY)
+    screen.blit(title_surface, title_surface.get_rect(centerx=box_rect.centerx, y=box_rect.y + 20))
+    expanded, generated, frontier, peak_frontier, closed = job.progress
+    info_lines = [f"Node đã duyệt: {expanded:,}", f"Node đã sinh: {generated:,}",
+                  f"Frontier: {frontier:,} (tối đa {peak_frontier:,})", f"Tập đóng: {closed:,}",
+                  f"Thời gian: {job.elapsed():.1f} s"]
+    line_y = box_rect.y + 65
+    for text in info_lines: line_surf = info_font_param.render(text, True, LIGHT_GRAY); screen.blit(line_surf, (box_rect.x + 30, line_y)); line_y += 30
+    # Thanh chạy qua lại: số node cần duyệt không biết trước nên không có phần trăm.
+    bar_rect = pygame.Rect(box_rect.x + 30, line_y + 10, box_rect.width - 60, 12); pygame.draw.rect(screen, GRAY, bar_rect, border_radius=6)
+    segment_width = bar_rect.width // 4; travel = bar_rect.width - segment_width
+    offset = pygame.time.get_ticks() // 4 % (2 * travel); offset = offset if offset < travel else 2 * travel - offset
+    pygame.draw.rect(screen, PRIMARY, pygame.Rect(bar_rect.x + offset, bar_rect.y, segment_width, bar_rect.height), border_radius=6)
+    cancel_btn.text = "Đang hủy..." if job.is_cancelling() else "Hủy"
+    cancel_btn.rect.centerx = box_rect.centerx; cancel_btn.rect.bottom = box_rect.bottom - 20; cancel_btn.draw(screen, button_font_param)
+
 def start_solving(selected_algorithm_index, start_state, goal_state, message_box):
-    global current_view, path, steps_found, elapsed_time, tiles, current_step, last_switch, puzzle_layout_info
-    global path_display_scroll_offset_pixels
+    """Validates the start state and launches the solver in a SolverJob; finish_solving handles the result."""
+    global solver_job
     if not is_valid_puzzle_state(start_state):
         message_box.title="Lỗi Trạng Thái"; message_box.message=f"Trạng thái bắt đầu không hợp lệ:\n{start_state}"; message_box.active=True; return False
     if not is_solvable(start_state):
@@ -500,36 +541,44 @@ def start_solving(selected_algorithm_index, start_state, goal_state, message_box
     algorithm_name, module_name = ALGORITHM_LIST[selected_algorithm_index]
     try:
         module = importlib.import_module(f"algorithms.{module_name}")
-        start_time_solve = time.time(); solve_result = module.solve(start_state, goal_state); elapsed_time = time.time() - start_time_solve
-        path, steps_found = None, None
-        if isinstance(solve_result, tuple) and len(solve_result) > 0:
-            path = solve_result[0]; steps_found = solve_result[1] if len(solve_result) > 1 and isinstance(solve_result[1], int) else None
-        elif isinstance(solve_result, list): path = solve_result
-        if path and isinstance(path, list) and len(path) > 0:
-            path_length = len(path) - 1; print(f"Solution found by {algorithm_name}: {path_length} steps. Search took {elapsed_time:.3f}s.")
-            if steps_found is None: steps_found = path_length
-            current_view = "solver"
-            tiles, p_start_x, p_start_y, p_width, p_tile_size = init_tiles(start_state)
-            puzzle_layout_info = {"x": p_start_x, "y": p_start_y, "tile_size": p_tile_size}
-            current_step = 0; last_switch = pygame.time.get_ticks()
-            path_display_scroll_offset_pixels = 0
-            return True
-        else: print(f"No solution found by {algorithm_name}. Search took {elapsed_time:.3f}s."); message_box.title="Không tìm thấy"; message_box.message=f"{algorithm_name} không tìm thấy đường đi."; message_box.active=True; return False
+        solve = module.solve if solution_cache is None else functools.partial(solution_cache.solve, module_name)
+        solver_job = SolverJob(solve, algorithm_name, start_state, goal_state)
+        return True
     except ImportError: print(f"Import Error: algorithms.{module_name}"); message_box.title="Lỗi Import"; message_box.message=f"Không thể tải thuật toán:\n'{module_name}'."; message_box.active=True; return False
     except AttributeError: print(f"Attribute Error: 'solve' not in algorithms.{module_name}"); message_box.title="Lỗi Thuật Toán"; message_box.message=f"Thuật toán '{module_name}' thiếu hàm 'solve'."; message_box.active=True; return False
     except Exception as e: print(f"Error solving with {algorithm_name}: {e}"); traceback.print_exc(); message_box.title="Lỗi Thực Thi"; message_box.message=f"Lỗi khi chạy {algorithm_name}:\n{e}"; message_box.active=True; return False
 
+def finish_solving(job, message_box):
+    """Called by the event loop once the worker thread is done: shows the path or reports why there is none."""
+    global current_view, path, search_stats, tiles, current_step, last_switch, puzzle_layout_info
+    global path_display_scroll_offset_pixels
+    algorithm_name = job.algorithm_name
+    if job.error is not None:
+        print(f"Error solving with {algorithm_name}: {job.error}"); message_box.title="Lỗi Thực Thi"; message_box.message=f"Lỗi khi chạy {algorithm_name}:\n{job.error}"; message_box.active=True; return False
+    search_stats = job.result; path = search_stats.path
+    if path:
+        print(f"Solution found by {algorithm_name}: {search_stats.steps} steps. Search took {search_stats.elapsed:.3f}s ({search_stats}).")
+        current_view = "solver"
+        tiles, p_start_x, p_start_y, p_width, p_tile_size = init_tiles(job.start_state)
+        puzzle_layout_info = {"x": p_start_x, "y": p_start_y, "tile_size": p_tile_size}
+        current_step = 0; last_switch = pygame.time.get_ticks()
+        path_display_scroll_offset_pixels = 0
+        return True
+    if search_stats.reason == "cancelled":
+        print(f"{algorithm_name} cancelled after {search_stats.expanded} expansions ({search_stats.elapsed:.3f}s)."); message_box.title="Đã hủy"; message_box.message=f"Đã dừng {algorithm_name}\nsau {search_stats.expanded:,} node."; message_box.active=True; return False
+    print(f"No solution found by {algorithm_name}. Search took {search_stats.elapsed:.3f}s."); message_box.title="Không tìm thấy"; message_box.message=f"{algorithm_name} không tìm thấy đường đi."; message_box.active=True; return False
+
 # --- Main Function ---
 def main():
     global START_STATE, screen, GOAL_STATE, WIDTH, HEIGHT, font, title_font, puzzle_font, button_font, info_font
-    global current_view, path, steps_found, elapsed_time, tiles, current_step, last_switch, switch_time
-    global puzzle_layout_info
+    global current_view, path, search_stats, tiles, current_step, last_switch, switch_time
+    global puzzle_layout_info, solver_job
     global path_display_scroll_offset_pixels, path_item_height
 
     clock = pygame.time.Clock(); running = True; current_view = "menu"
     path = None; current_step = 0; auto_mode = True; last_switch = 0
     switch_time = DEFAULT_ANIMATION_SPEED
-    tiles = None; steps_found = None; elapsed_time = None; selected_algorithm_index = 0
+    tiles = None; search_stats = None; selected_algorithm_index = 0; solver_job = None
     puzzle_layout_info = {}
 
     path_display_scroll_offset_pixels = 0
@@ -568,6 +617,7 @@ def main():
     blind_preview_button_width = 220; blind_preview_button_height = 45
     start_blind_run_btn = Button(0, 0, blind_preview_button_width, blind_preview_button_height, "Bắt đầu Tìm kiếm mù")
     back_menu_from_preview_btn = Button(0, 0, 150, blind_preview_button_height, "Quay lại Menu")
+    cancel_solve_btn = Button(0, 0, 160, 40, "Hủy", color=RED, hover_color=(170, 40, 40))
 
     current_path_display_box_rect = None
     path_display_content_area_height = 0
@@ -577,7 +627,14 @@ def main():
         current_step_updated_this_frame = False
 
         for event in pygame.event.get():
-            if event.type == pygame.QUIT: running = False
+            if event.type == pygame.QUIT:
+                running = False
+                if solver_job is not None: solver_job.cancel()
+            if solver_job is not None:
+                # Trong lúc đang giải chỉ nhận nút Hủy (hoặc Esc); các thao tác khác bị bỏ qua.
+                if (event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and cancel_solve_btn.rect.collidepoint(event.pos)) or \
+                   (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE): solver_job.cancel()
+                continue
             if message_box.active:
                 if message_box.handle_event(event): continue
             if current_view == "solver":
@@ -627,6 +684,8 @@ def main():
                                 editor_tiles[editor_selected_idx].value = new_val
                             except ValueError: pass
                             editor_selected_idx = -1
+        if solver_job is not None and solver_job.done:
+            finish_solving(solver_job, message_box); solver_job = None
         if current_view == "menu":
             speed_slider.active = False
             if sidebar_rect.collidepoint(mouse_pos):
@@ -790,12 +849,12 @@ def main():
             
             for btn in [auto_btn, next_btn, reset_btn, back_menu_btn]: btn.check_hover(mouse_pos); btn.draw(screen, button_font)
             if path:
-                path_length = len(path) - 1
-                draw_info_box(screen, font, info_font, steps_found, path_length, current_step, path_length, ALGORITHM_LIST[selected_algorithm_index][0], elapsed_time, current_info_box_rect)
+                draw_info_box(screen, font, info_font, search_stats, current_step, ALGORITHM_LIST[selected_algorithm_index][0], current_info_box_rect)
                 if current_path_display_box_rect:
                     draw_path_display_box(screen, font, info_font, path, current_step,
                                           current_path_display_box_rect,
                                           path_display_scroll_offset_pixels, path_item_height)
+        if solver_job is not None: cancel_solve_btn.check_hover(mouse_pos); draw_solving_overlay(screen, font, info_font, button_font, solver_job, cancel_solve_btn)
         if message_box.active: message_box.draw(screen, title_font, font, button_font); message_box.check_hover(mouse_pos)
         pygame.display.flip(); clock.tick(60)
     pygame.quit(); sys.exit()
@@ -0,0 +1,67 @@
+import json
+
+import pytest
+
+from algorithms import batch, bfs
+from algorithms.stats import SOLVED, SearchStats
+
+GOAL = (1, 2, 3, 4, 5, 6, 7, 8, 9)
+START = (1, 2, 3, 4, 9, 6, 7, 5, 8)     # two slides from the goal
+
+
+def test_resolve_algorithm_by_module_or_label():
+    assert batch.resolve_algorithm("a_star") == "a_star"
+    assert batch.resolve_algorithm("a* search") == "a_star"
+    with pytest.raises(ValueError, match="Unknown algorithm"):
+        batch.resolve_algorithm("nope")
+
+
+def test_parse_instance_defaults():
+    assert batch.parse_instance('{"id": 7, "start": [1, 2, 3, 4, 9, 6, 7, 5, 8]}', "bfs") == (7, "bfs", START, GOAL)
+    assert batch.parse_instance('[1, 2, 3, 4, 9, 6, 7, 5, 8]', "bfs") == (None, "bfs", START, GOAL)
+    line = json.dumps({"start": list(START), "goal": list(GOAL), "algorithm": "greedy"})
+    assert batch.parse_instance(line, "bfs")[1:] == ("greedy", START, GOAL)
+
+
+def test_invalid_and_unsolvable_lines_become_failure_records():
+    records = list(batch.solve_stream(['{"start": [1, 2, 3]}', "[2, 1, 3, 4, 5, 6, 7, 8, 9]", "not json"], "bfs"))
+    assert [r["line"] for r in records] == [1, 2, 3]
+    assert not any(r["solved"] for r in records)
+    assert all(r["error"] for r in records)
+
+
+def test_stdout_holds_only_jsonl(tmp_path, monkeypatch, capsys):
+    solve = bfs.solve
+
+    def chatty(start_state, goal_state, **kwargs):
+        print("solver chatter")
+        return solve(start_state, goal_state, **kwargs)
+
+    monkeypatch.setattr(bfs, "solve", chatty)
+    puzzles = tmp_path / "puzzles.jsonl"
+    puzzles.write_text(json.dumps({"id": "a", "start": list(START)}) + "\n\n[2, 1, 3, 4, 5, 6, 7, 8, 9]\n")
+    assert batch.main([str(puzzles), "--algorithm", "bfs"]) == 1
+    out, err = capsys.readouterr()
+    records = [json.loads(line) for line in out.splitlines()]
+    assert [r["line"] for r in records] == [1, 3]
+    assert records[0]["id"] == "a" and records[0]["solved"] and records[0]["moves"] == "DR"
+    assert "solver chatter" in err
+
+
+def test_workers_keep_input_order():
+    starts = [(8, 6, 7, 2, 5, 4, 3, 9, 1), START, (1, 2, 3, 4, 5, 6, 7, 9, 8), GOAL]
+    lines = [json.dumps({"id": number, "start": list(start)}) for number, start in enumerate(starts)]
+    records = list(batch.solve_stream(lines, "a_star", workers=2, chunksize=1))
+    assert [r["id"] for r in records] == [0, 1, 2, 3]
+    assert all(r["solved"] for r in records)
+
+
+def test_disconnected_path_is_a_failure_that_keeps_the_counters(monkeypatch):
+    def jumpy(start_state, goal_state, **kwargs):
+        return SearchStats([start_state, (2, 1, 3, 4, 9, 6, 7, 5, 8), goal_state], SOLVED, expanded=5, generated=9)
+
+    monkeypatch.setattr(bfs, "solve", jumpy)
+    record = batch.solve_instance("bfs", START, GOAL)
+    assert not record["solved"] and record["error"].startswith("invalid path")
+    assert record["moves"] is None and record["nodes_expanded"] == 5
+    assert record["stats"]["expanded"] == 5 and record["stats"]["generated"] == 9
@@ -0,0 +1,23 @@
+import random
+
+from algorithms import benchmark, stochastic_hill
+from algorithms.core import move_string
+
+INSTANCES = benchmark.load_corpus(benchmark.corpus_path("single"), per_depth=2, max_depth=8)
+
+
+def test_restarting_local_search_is_recorded():
+    for instance in INSTANCES:
+        run = benchmark.measure("stochastic_hill", instance, trace_memory=False)
+        assert run["id"] == instance["id"] and len(run["times"]) == 1
+        if run["solved"]:
+            assert run["cost"] >= instance["depth"]
+
+
+def test_stochastic_hill_restart_keeps_the_path_contiguous():
+    random.seed(benchmark.RUN_SEED)
+    for instance in INSTANCES:
+        result = stochastic_hill.solve(tuple(instance["start"]), tuple(instance["goal"]))
+        if result.path:
+            assert result.path[0] == tuple(instance["start"])
+            move_string(result.path)
@@ -0,0 +1,43 @@
+from algorithms.budget import Budget
+from algorithms.cache import SolutionCache
+from algorithms.core import move_string
+
+GOAL = (1, 2, 3, 4, 5, 6, 7, 8, 9)
+START = (1, 2, 3, 4, 9, 6, 7, 5, 8)     # two slides from the goal
+MIRRORED_GOAL = (3, 2, 1, 6, 5, 4, 9, 8, 7)
+MIRRORED_START = (3, 2, 1, 6, 9, 4, 8, 5, 7)
+
+
+def test_equivalent_instance_hits_and_gets_its_own_path():
+    cache = SolutionCache()
+    first = cache.solve("bfs", START, GOAL)
+    assert not first.cached and cache.info()["misses"] == 1
+
+    mirrored = cache.solve("bfs", MIRRORED_START, MIRRORED_GOAL)
+    assert mirrored.cached and cache.info()["hits"] == 1
+    assert mirrored.path[0] == MIRRORED_START and mirrored.path[-1] == MIRRORED_GOAL
+    assert len(move_string(mirrored.path)) == first.steps
+    assert mirrored.expanded == first.expanded
+
+
+def test_options_are_part_of_the_key():
+    cache = SolutionCache()
+    cache.solve("a_star", START, GOAL, heuristic="manhattan")
+    assert not cache.solve("a_star", START, GOAL, heuristic="linear_conflict").cached
+    assert cache.solve("a_star", START, GOAL, heuristic="manhattan").cached
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = SolutionCache(maxsize=1, use_symmetries=False)
+    cache.solve("bfs", START, GOAL)
+    cache.solve("bfs", (1, 2, 3, 4, 5, 6, 7, 9, 8), GOAL)
+    assert len(cache) == 1
+    assert not cache.solve("bfs", START, GOAL).cached
+
+
+def test_budget_stopped_and_unsolvable_results_are_not_stored():
+    cache = SolutionCache()
+    stopped = cache.solve("bfs", (8, 6, 7, 2, 5, 4, 3, 9, 1), GOAL, budget=Budget(expansions=10))
+    assert stopped.status == "budget_exceeded"
+    assert not cache.solve("bfs", (2, 1, 3, 4, 5, 6, 7, 8, 9), GOAL)
+    assert len(cache) == 0
@@ -0,0 +1,12 @@
+from algorithms import dfs_ANDOR
+from algorithms.ranking import SOLVABLE_COUNT
+
+GOAL = (1, 2, 3, 4, 5, 6, 7, 8, 9)
+START = (1, 2, 9, 4, 5, 3, 7, 8, 6)     # corpus d01-0: one move from the goal
+
+
+def test_depth_one_instance_expands_every_state_at_most_once():
+    result = dfs_ANDOR.solve(START, GOAL)
+    assert result.solved and result.path[0] == START and result.path[-1] == GOAL
+    assert result.reexpanded == 0
+    assert result.expanded <= SOLVABLE_COUNT
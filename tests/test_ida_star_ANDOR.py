@@ -0,0 +1,10 @@
+from algorithms import ida_star_ANDOR
+from algorithms.stats import NOT_FOUND
+
+GOAL = (1, 2, 3, 4, 5, 6, 7, 8, 9)
+
+
+def test_outcome_is_reported_through_the_stats_not_stdout(capsys):
+    assert ida_star_ANDOR.solve((2, 1, 3, 4, 5, 6, 7, 8, 9), GOAL).status == NOT_FOUND
+    assert ida_star_ANDOR.solve((1, 2, 3, 4, 9, 6, 7, 5, 8), GOAL).steps == 1
+    assert capsys.readouterr().out == ""
@@ -0,0 +1,29 @@
+from algorithms import portfolio
+from algorithms.core import move_string
+
+GOAL = (1, 2, 3, 4, 5, 6, 7, 8, 9)
+START = (1, 2, 3, 4, 9, 6, 7, 5, 8)     # two slides from the goal
+MEMBERS = ("a_star", "greedy")
+
+
+def test_returns_a_valid_path_with_the_winners_counters(capsys):
+    result = portfolio.solve(START, GOAL, MEMBERS)
+    assert result.solved
+    assert result.path[0] == START and result.path[-1] == GOAL
+    assert len(move_string(result.path)) == 2
+    assert result.solver in MEMBERS
+    assert result.expanded > 0 and result.generated > 0
+    assert "race" in result.phases and set(result.phases) <= {"search", "race"}
+    assert sum(result.phases.values()) <= result.elapsed
+    assert capsys.readouterr().out == ""
+
+
+def test_deadline_keeps_the_shortest_path():
+    result = portfolio.solve(START, GOAL, MEMBERS, deadline=5.0)
+    assert result.solved and result.steps == 2
+    assert result.as_dict()["solver"] == result.solver
+
+
+def test_unsolvable_instance():
+    result = portfolio.solve((2, 1, 3, 4, 5, 6, 7, 8, 9), GOAL, MEMBERS)
+    assert not result and result.solver is None and result.expanded == 0
@@ -0,0 +1,48 @@
+import json
+import os
+import subprocess
+import sys
+
+from algorithms import q_learning, q_store
+
+GOAL = (1, 2, 3, 4, 5, 6, 7, 8, 9)
+START = (1, 2, 3, 4, 5, 6, 7, 9, 8)     # one slide from the goal
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in a fresh interpreter with a small batched run: looks the model up the way
+# solve() does, reports its counters as found, then solves and reports the store.
+SCRIPT = f"""
+import json, random
+from algorithms import q_learning, q_store
+random.seed(0)
+q_learning.ENVIRONMENTS = 64; q_learning.BATCH_STEPS = 20
+agent = q_learning.model_store.agent({GOAL!r}, **q_learning.hyperparameters())
+found = [agent.training_episodes, agent.nodes_expanded_during_training]
+q_learning.solve({START!r}, {GOAL!r})
+print(json.dumps({{"found": found, "trained": [agent.training_episodes, agent.nodes_expanded_during_training],
+                  "name": q_store.model_name({GOAL!r}, **q_learning.hyperparameters()),
+                  "info": q_learning.model_store.info()}}))
+"""
+
+
+def _run_in_new_process(table_dir):
+    env = dict(os.environ, PUZZLE_TABLE_DIR=str(table_dir))
+    output = subprocess.run([sys.executable, "-c", SCRIPT], cwd=ROOT, env=env,
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def test_solve_looks_up_the_name_save_writes():
+    agent = q_learning.QLearningAgent(GOAL, **q_learning.hyperparameters())
+    assert agent.hyperparameters == q_learning.hyperparameters()
+    assert q_store.model_name(GOAL, **agent.hyperparameters) == q_store.model_name(GOAL, **q_learning.hyperparameters())
+
+
+def test_model_saved_by_one_process_is_loaded_by_the_next(tmp_path):
+    first = _run_in_new_process(tmp_path)
+    assert first["found"] == [0, 0] and first["info"]["loaded"] == 0 and first["info"]["saved"] >= 1
+    assert "planning_steps0" in first["name"] and (tmp_path / first["name"]).exists()
+
+    second = _run_in_new_process(tmp_path)
+    assert second["name"] == first["name"] and second["info"]["loaded"] == 1
+    assert second["found"] == first["trained"]
@@ -0,0 +1,85 @@
+import json
+
+import pytest
+
+from algorithms import benchmark
+from algorithms.regression import IMPROVEMENT, REGRESSION, compare_results, holm, signed_rank_p, spread
+
+
+def results(times, expanded=100, solved=True, repeat=3, jitter=0.0):
+    """A result file with one bucket (depths 20-23) of a_star runs, ``times`` given per instance."""
+    runs = []
+    for i, t in enumerate(times):
+        repeats = [t * (1 - jitter), t, t * (1 + jitter)]
+        runs.append({"algorithm": "a_star", "id": f"s{i}", "depth": 20 + i % 4, "solved": solved,
+                     "time": t, "times": repeats, "expanded": expanded, "memory": None})
+    return {"meta": {"repeat": repeat, "bucket_width": 4}, "runs": runs}
+
+
+BASE = [0.05 + 0.002 * i for i in range(12)]
+
+
+def rows_for(baseline, candidate, metric):
+    return [row for row in compare_results(baseline, candidate) if row["metric"] == metric]
+
+
+def test_signed_rank_exact_values():
+    assert signed_rank_p([1, 2, 3, 4, 5]) == pytest.approx(1 / 32)
+    assert signed_rank_p([-1, -2, -3, -4, -5]) == 1.0
+    assert signed_rank_p([0, 0]) == 1.0
+
+
+def test_holm_adjustment():
+    assert holm([0.01, 0.04, 0.03]) == pytest.approx([0.03, 0.06, 0.06])
+    assert holm([]) == []
+
+
+def test_spread():
+    assert spread([0.1]) == 0.0
+    assert spread([0.1, 0.2, 0.15]) == pytest.approx(0.6931, abs=1e-4)
+
+
+def test_identical_runs_are_not_flagged():
+    rows = compare_results(results(BASE), results(BASE))
+    assert rows and not any(row["verdict"] for row in rows)
+
+
+def test_consistent_slowdown_is_a_regression():
+    (row,) = rows_for(results(BASE), results([t * 1.5 for t in BASE]), "time")
+    assert row["verdict"] == REGRESSION
+    assert 40 < row["change"] <= 50      # the 2 ms time floor damps the ratio slightly
+    assert row["p_adj"] >= row["p"]
+
+
+def test_speedup_is_an_improvement():
+    (row,) = rows_for(results(BASE), results([t * 0.5 for t in BASE]), "time")
+    assert row["verdict"] == IMPROVEMENT
+
+
+def test_change_within_repeat_noise_is_not_flagged():
+    # Repeats spread +-40%, so a 20% shift is indistinguishable from noise.
+    (row,) = rows_for(results(BASE, jitter=0.4), results([t * 1.2 for t in BASE], jitter=0.4), "time")
+    assert row["noise"] > 20 and row["verdict"] == ""
+
+
+def test_expansions_and_lost_solves():
+    rows = compare_results(results(BASE), results(BASE, expanded=130, solved=False))
+    verdicts = {row["metric"]: row["verdict"] for row in rows}
+    assert verdicts["expanded"] == REGRESSION
+    assert verdicts["solved"] == REGRESSION
+
+
+def test_single_repeat_files_are_rejected():
+    with pytest.raises(ValueError):
+        compare_results(results(BASE, repeat=1), results(BASE))
+
+
+def test_compare_command_exit_codes(tmp_path, capsys):
+    files = {}
+    for name, data in {"base": results(BASE), "same": results(BASE), "slow": results([t * 1.5 for t in BASE]),
+                       "once": results(BASE, repeat=1)}.items():
+        files[name] = tmp_path / f"{name}.json"
+        files[name].write_text(json.dumps(data))
+    assert benchmark.main(["compare", str(files["base"]), str(files["same"])]) == 0
+    assert benchmark.main(["compare", str(files["base"]), str(files["slow"])]) == 1
+    assert benchmark.main(["compare", str(files["once"]), str(files["base"])]) == 2
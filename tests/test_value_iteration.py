@@ -0,0 +1,22 @@
+from algorithms import oracle, value_iteration
+from algorithms.core import move_string
+
+GOAL = (1, 2, 3, 4, 5, 6, 7, 8, 9)
+INSTANCES = [
+    ((1, 2, 3, 4, 9, 6, 7, 5, 8), GOAL),
+    ((8, 6, 7, 2, 5, 4, 3, 9, 1), GOAL),                            # one of the two 31-move states
+    ((4, 1, 3, 7, 2, 6, 9, 5, 8), (1, 2, 3, 4, 9, 5, 7, 8, 6)),    # goal with the blank elsewhere
+]
+
+
+def test_policy_paths_are_optimal():
+    for start, goal in INSTANCES:
+        result = value_iteration.solve(start, goal)
+        assert result.solved
+        assert result.path[0] == start and result.path[-1] == goal
+        assert len(move_string(result.path)) == result.steps == oracle.distance(start, goal)
+
+
+def test_goal_and_unsolvable_instances():
+    assert value_iteration.solve(GOAL, GOAL).steps == 0
+    assert not value_iteration.solve((2, 1, 3, 4, 5, 6, 7, 8, 9), GOAL)